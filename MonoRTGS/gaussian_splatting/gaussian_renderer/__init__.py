@@ -29,11 +29,15 @@ def render(
     scaling_modifier=1.0,
     override_color=None,
     mask=None,
+    theta=None,
+    rho=None,
 ):
     """
     Render the scene.
 
     Background tensor (bg_color) must be on GPU!
+    theta and rho override the camera's cam_rot_delta and cam_trans_delta
+    as the pose deltas that receive gradients.
     """
 
     # Create zero tensor. We will use it to make pytorch return gradients of the 2D (screen-space) means
@@ -72,6 +76,10 @@ def render(
     )
 
     rasterizer = GaussianRasterizer(raster_settings=raster_settings)
+    if theta is None:
+        theta = viewpoint_camera.cam_rot_delta
+    if rho is None:
+        rho = viewpoint_camera.cam_trans_delta
 
     means3D = pc.get_xyz
     means2D = screenspace_points
@@ -123,8 +131,8 @@ def render(
             scales=scales[mask],
             rotations=rotations[mask],
             cov3D_precomp=cov3D_precomp[mask] if cov3D_precomp is not None else None,
-            theta=viewpoint_camera.cam_rot_delta,
-            rho=viewpoint_camera.cam_trans_delta,
+            theta=theta,
+            rho=rho,
         )
     else:
         rendered_image, radii, depth, opacity, n_touched = rasterizer(
@@ -136,8 +144,8 @@ def render(
             scales=scales,
             rotations=rotations,
             cov3D_precomp=cov3D_precomp,
-            theta=viewpoint_camera.cam_rot_delta,
-            rho=viewpoint_camera.cam_trans_delta,
+            theta=theta,
+            rho=rho,
         )
 
     # Those Gaussians that were frustum culled or had a radius of 0 were not visible.
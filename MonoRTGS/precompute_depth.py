@@ -0,0 +1,40 @@
+"""
+Fill the stereo depth cache of a sequence in parallel, so SLAM runs read
+disparities from disk instead of running SGBM on every frame
+
+The config must describe a stereo (EuRoC) dataset; this tree ships only
+TUM configs, so pass your own. Without a Calibration.baseline entry (metres)
+depth uses the EuRoC rig baseline behind ORB-SLAM2's bf = 47.906.
+
+Usage:
+    python precompute_depth.py --config <euroc_config>.yaml --workers 8
+"""
+
+import sys
+from argparse import ArgumentParser
+
+from utils.config_utils import load_config
+from utils.dataset import precompute_stereo_depth
+from utils.logging_utils import Log
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Stereo depth precompute parameters")
+    parser.add_argument("--config", type=str)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--depth-cache",
+        type=str,
+        default=None,
+        help="Cache directory (default: Dataset.depth_cache, else <dataset_path>/depth_cache)",
+    )
+
+    args = parser.parse_args(sys.argv[1:])
+
+    config = load_config(args.config)
+    if args.depth_cache:
+        config["Dataset"]["depth_cache"] = args.depth_cache
+    elif not config["Dataset"].get("depth_cache"):
+        config["Dataset"]["depth_cache"] = True
+
+    count = precompute_stereo_depth(config, args.workers)
+    Log(f"Done, computed {count} depth maps.")
@@ -1,14 +1,18 @@
-import csv
 import glob
+import hashlib
+import json
 import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import cv2
 import numpy as np
 import torch
-import trimesh
 from PIL import Image
 
 from gaussian_splatting.utils.graphics_utils import focal2fov
+from utils.logging_utils import Log
 
 try:
     import pyrealsense2 as rs
@@ -16,63 +20,176 @@ except Exception:
     pass
 
 
+# Bump when the contents of the dataset index change
+DATASET_INDEX_VERSION = 1
+DATASET_INDEX_NAME = "dataset_index.npz"
+
+_QUATERNION_EPS = np.finfo(float).eps * 4.0
+
+
+def load_dataset_index(input_folder, sources, params, build):
+    """
+    Columnar index of a sequence (path arrays and an (N,4,4) pose array),
+    loaded from dataset_index.npz next to the data when it was built from the
+    same source files, else built and saved there
+
+    Args:
+        input_folder: Dataset directory the index is stored in
+        sources: Files and directories the index is parsed from; their size
+                 and modification time key the index
+        params: Parser parameters the index depends on
+        build: Returns the index as a dict of arrays
+
+    Returns:
+        Dict of index arrays
+    """
+    stamp = [DATASET_INDEX_VERSION, os.path.abspath(input_folder), params]
+    for source in sources:
+        stat = os.stat(source)
+        stamp.append([source, stat.st_size, stat.st_mtime_ns])
+    key = hashlib.sha256(json.dumps(stamp, sort_keys=True).encode()).hexdigest()
+
+    path = os.path.join(input_folder, DATASET_INDEX_NAME)
+    try:
+        with np.load(path) as data:
+            if str(data["key"]) == key:
+                return {name: data[name] for name in data.files if name != "key"}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        pass
+
+    index = build()
+    # Read-only datasets just parse on every startup
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, key=np.array(key), **index)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return index
+
+
+def quaternion_matrices(quaternions):
+    """(N,4,4) rotations of (N,4) w-first quaternions, as trimesh's quaternion_matrix"""
+    q = np.array(quaternions, dtype=np.float64, ndmin=2)
+    n = np.einsum("ij,ij->i", q, q)
+    valid = n >= _QUATERNION_EPS
+    q[valid] *= np.sqrt(2.0 / n[valid])[:, None]
+    q = q[:, :, None] * q[:, None, :]
+
+    T = np.tile(np.eye(4), (len(q), 1, 1))
+    T[:, 0, 0] = 1.0 - q[:, 2, 2] - q[:, 3, 3]
+    T[:, 0, 1] = q[:, 1, 2] - q[:, 3, 0]
+    T[:, 0, 2] = q[:, 1, 3] + q[:, 2, 0]
+    T[:, 1, 0] = q[:, 1, 2] + q[:, 3, 0]
+    T[:, 1, 1] = 1.0 - q[:, 1, 1] - q[:, 3, 3]
+    T[:, 1, 2] = q[:, 2, 3] - q[:, 1, 0]
+    T[:, 2, 0] = q[:, 1, 3] - q[:, 2, 0]
+    T[:, 2, 1] = q[:, 2, 3] + q[:, 1, 0]
+    T[:, 2, 2] = 1.0 - q[:, 1, 1] - q[:, 2, 2]
+    T[~valid] = np.eye(4)
+    return T
+
+
+def associate_timestamps(reference, query, max_dt=None):
+    """
+    Nearest reference timestamp of every query timestamp in O((N + M) log M),
+    the same index np.argmin(np.abs(reference - t)) picks, ties included
+
+    Args:
+        reference: (M,) timestamps to match against, in any order
+        query: (N,) timestamps to match
+        max_dt: Matches must lie strictly closer than this; None accepts all
+
+    Returns:
+        (N,) reference indices and an (N,) bool mask of accepted matches
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    query = np.asarray(query, dtype=np.float64)
+    if len(reference) == 1:
+        indices = np.zeros(len(query), dtype=np.int64)
+    else:
+        order = np.argsort(reference, kind="stable")
+        ordered = reference[order]
+        right = np.clip(np.searchsorted(ordered, query), 1, len(ordered) - 1)
+        # First of any repeated value, i.e. its lowest original index
+        left = np.searchsorted(ordered, ordered[right - 1])
+        dist_left = np.abs(ordered[left] - query)
+        dist_right = np.abs(ordered[right] - query)
+        left, right = order[left], order[right]
+        take_right = (dist_right < dist_left) | (
+            (dist_right == dist_left) & (right < left)
+        )
+        indices = np.where(take_right, right, left)
+
+    if max_dt is None:
+        return indices, np.ones(len(query), dtype=bool)
+    return indices, np.abs(reference[indices] - query) < max_dt
+
+
 class ReplicaParser:
     def __init__(self, input_folder):
         self.input_folder = input_folder
-        self.color_paths = sorted(glob.glob(f"{self.input_folder}/results/frame*.jpg"))
-        self.depth_paths = sorted(glob.glob(f"{self.input_folder}/results/depth*.png"))
+        index = load_dataset_index(
+            input_folder,
+            [f"{input_folder}/results", f"{input_folder}/traj.txt"],
+            {"parser": "replica"},
+            self.build_index,
+        )
+        self.color_paths = index["color_paths"].tolist()
+        self.depth_paths = index["depth_paths"].tolist()
+        self.poses = index["poses"]
         self.n_img = len(self.color_paths)
-        self.load_poses(f"{self.input_folder}/traj.txt")
 
-    def load_poses(self, path):
-        self.poses = []
-        with open(path, "r") as f:
-            lines = f.readlines()
-
-        frames = []
-        for i in range(self.n_img):
-            line = lines[i]
-            pose = np.array(list(map(float, line.split()))).reshape(4, 4)
-            pose = np.linalg.inv(pose)
-            self.poses.append(pose)
-            frame = {
-                "file_path": self.color_paths[i],
-                "depth_path": self.depth_paths[i],
-                "transform_matrix": pose.tolist(),
-            }
-
-            frames.append(frame)
-        self.frames = frames
+    def build_index(self):
+        color_paths = sorted(glob.glob(f"{self.input_folder}/results/frame*.jpg"))
+        depth_paths = sorted(glob.glob(f"{self.input_folder}/results/depth*.png"))
+        return {
+            "color_paths": np.array(color_paths),
+            "depth_paths": np.array(depth_paths),
+            "poses": self.load_poses(f"{self.input_folder}/traj.txt", len(color_paths)),
+        }
+
+    def load_poses(self, path, n_img):
+        c2w = np.loadtxt(path, dtype=np.float64, max_rows=n_img).reshape(-1, 4, 4)
+        return np.linalg.inv(c2w)
 
 
 class TUMParser:
-    def __init__(self, input_folder):
+    def __init__(self, input_folder, frame_rate=32):
         self.input_folder = input_folder
-        self.load_poses(self.input_folder, frame_rate=32)
+        sources = [
+            os.path.join(input_folder, name)
+            for name in ("rgb.txt", "depth.txt", "groundtruth.txt", "pose.txt")
+            if os.path.isfile(os.path.join(input_folder, name))
+        ]
+        index = load_dataset_index(
+            input_folder,
+            sources,
+            {"parser": "tum", "frame_rate": frame_rate},
+            lambda: self.load_poses(input_folder, frame_rate),
+        )
+        self.color_paths = index["color_paths"].tolist()
+        self.depth_paths = index["depth_paths"].tolist()
+        self.poses = index["poses"]
         self.n_img = len(self.color_paths)
 
     def parse_list(self, filepath, skiprows=0):
-        data = np.loadtxt(filepath, delimiter=" ", dtype=np.unicode_, skiprows=skiprows)
-        return data
+        with open(filepath) as f:
+            lines = f.read().splitlines()[skiprows:]
+        rows = [line.split() for line in lines if line.strip() and not line.startswith("#")]
+        return np.array(rows)
 
     def associate_frames(self, tstamp_image, tstamp_depth, tstamp_pose, max_dt=0.08):
-        associations = []
-        for i, t in enumerate(tstamp_image):
-            if tstamp_pose is None:
-                j = np.argmin(np.abs(tstamp_depth - t))
-                if np.abs(tstamp_depth[j] - t) < max_dt:
-                    associations.append((i, j))
-
-            else:
-                j = np.argmin(np.abs(tstamp_depth - t))
-                k = np.argmin(np.abs(tstamp_pose - t))
-
-                if (np.abs(tstamp_depth[j] - t) < max_dt) and (
-                    np.abs(tstamp_pose[k] - t) < max_dt
-                ):
-                    associations.append((i, j, k))
+        frames = np.arange(len(tstamp_image))
+        depth_idx, valid = associate_timestamps(tstamp_depth, tstamp_image, max_dt)
+        streams = [frames, depth_idx]
+        if tstamp_pose is not None:
+            pose_idx, valid_pose = associate_timestamps(tstamp_pose, tstamp_image, max_dt)
+            streams.append(pose_idx)
+            valid &= valid_pose
 
-        return associations
+        return list(zip(*(stream[valid].tolist() for stream in streams)))
 
     def load_poses(self, datapath, frame_rate=-1):
         if os.path.isfile(os.path.join(datapath, "groundtruth.txt")):
@@ -100,32 +217,37 @@ class TUMParser:
             if t1 - t0 > 1.0 / frame_rate:
                 indicies += [i]
 
-        self.color_paths, self.poses, self.depth_paths, self.frames = [], [], [], []
+        i, j, k = np.array([associations[ix] for ix in indicies]).T
+        T = quaternion_matrices(np.roll(pose_vecs[k, 4:], 1, axis=1))
+        T[:, :3, 3] = pose_vecs[k, 1:4]
 
-        for ix in indicies:
-            (i, j, k) = associations[ix]
-            self.color_paths += [os.path.join(datapath, image_data[i, 1])]
-            self.depth_paths += [os.path.join(datapath, depth_data[j, 1])]
-
-            quat = pose_vecs[k][4:]
-            trans = pose_vecs[k][1:4]
-            T = trimesh.transformations.quaternion_matrix(np.roll(quat, 1))
-            T[:3, 3] = trans
-            self.poses += [np.linalg.inv(T)]
-
-            frame = {
-                "file_path": str(os.path.join(datapath, image_data[i, 1])),
-                "depth_path": str(os.path.join(datapath, depth_data[j, 1])),
-                "transform_matrix": (np.linalg.inv(T)).tolist(),
-            }
-
-            self.frames.append(frame)
+        return {
+            "color_paths": np.array([os.path.join(datapath, name) for name in image_data[i, 1]]),
+            "depth_paths": np.array([os.path.join(datapath, name) for name in depth_data[j, 1]]),
+            "poses": np.linalg.inv(T),
+        }
 
 
 class EuRoCParser:
     def __init__(self, input_folder, start_idx=0):
         self.input_folder = input_folder
         self.start_idx = start_idx
+        index = load_dataset_index(
+            input_folder,
+            [
+                f"{input_folder}/mav0/cam0/data",
+                f"{input_folder}/mav0/cam1/data",
+                f"{input_folder}/mav0/state_groundtruth_estimate0/data.csv",
+            ],
+            {"parser": "euroc", "start_idx": start_idx},
+            self.build_index,
+        )
+        self.color_paths = index["color_paths"].tolist()
+        self.color_paths_r = index["color_paths_r"].tolist()
+        self.poses = index["poses"]
+        self.n_img = len(self.color_paths)
+
+    def build_index(self):
         self.color_paths = sorted(
             glob.glob(f"{self.input_folder}/mav0/cam0/data/*.png")
         )
@@ -133,29 +255,27 @@ class EuRoCParser:
             glob.glob(f"{self.input_folder}/mav0/cam1/data/*.png")
         )
         assert len(self.color_paths) == len(self.color_paths_r)
-        self.color_paths = self.color_paths[start_idx:]
-        self.color_paths_r = self.color_paths_r[start_idx:]
+        self.color_paths = self.color_paths[self.start_idx:]
+        self.color_paths_r = self.color_paths_r[self.start_idx:]
         self.n_img = len(self.color_paths)
-        self.load_poses(
-            f"{self.input_folder}/mav0/state_groundtruth_estimate0/data.csv"
-        )
+        return {
+            "color_paths": np.array(self.color_paths),
+            "color_paths_r": np.array(self.color_paths_r),
+            "poses": self.load_poses(
+                f"{self.input_folder}/mav0/state_groundtruth_estimate0/data.csv"
+            ),
+        }
 
     def associate(self, ts_pose):
-        pose_indices = []
-        for i in range(self.n_img):
-            color_ts = float((self.color_paths[i].split("/")[-1]).split(".")[0])
-            k = np.argmin(np.abs(ts_pose - color_ts))
-            pose_indices.append(k)
+        color_ts = np.array(
+            [float((path.split("/")[-1]).split(".")[0]) for path in self.color_paths]
+        )
+        pose_indices, _ = associate_timestamps(ts_pose, color_ts)
 
         return pose_indices
 
     def load_poses(self, path):
-        self.poses = []
-        with open(path) as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            data = [list(map(float, row)) for row in reader]
-        data = np.array(data)
+        data = np.loadtxt(path, dtype=np.float64, delimiter=",", skiprows=1, ndmin=2)
         T_i_c0 = np.array(
             [
                 [0.0148655429818, -0.999880929698, 0.00414029679422, -0.0216401454975],
@@ -168,26 +288,27 @@ class EuRoCParser:
         pose_ts = data[:, 0]
         pose_indices = self.associate(pose_ts)
 
-        frames = []
-        for i in range(self.n_img):
-            trans = data[pose_indices[i], 1:4]
-            quat = data[pose_indices[i], 4:8]
-            quat = quat[[1, 2, 3, 0]]
-            
-            
-            T_w_i = trimesh.transformations.quaternion_matrix(np.roll(quat, 1))
-            T_w_i[:3, 3] = trans
-            T_w_c = np.dot(T_w_i, T_i_c0)
+        # Ground truth quaternions are stored w first
+        T_w_i = quaternion_matrices(data[pose_indices, 4:8])
+        T_w_i[:, :3, 3] = data[pose_indices, 1:4]
+        T_w_c = T_w_i @ T_i_c0
+
+        return np.linalg.inv(T_w_c)
 
-            self.poses += [np.linalg.inv(T_w_c)]
 
-            frame = {
-                "file_path": self.color_paths[i],
-                "transform_matrix": (np.linalg.inv(T_w_c)).tolist(),
-            }
+# Bump when the layout or contents of the frame cache change
+FRAME_CACHE_VERSION = 1
+# Bump when the format of cached stereo disparities changes
+DEPTH_CACHE_VERSION = 1
 
-            frames.append(frame)
-        self.frames = frames
+# ORB-SLAM2's EuRoC rig: baseline*fx of 47.90639384423901 at fx 435.2046959714599
+EUROC_BASELINE = 47.90639384423901 / 435.2046959714599
+DEFAULT_STEREO_PARAMS = {
+    "min_disparity": 0,
+    "num_disparities": 64,
+    "block_size": 20,
+    "uniqueness_ratio": 40,
+}
 
 
 class BaseDataset(torch.utils.data.Dataset):
@@ -198,12 +319,117 @@ class BaseDataset(torch.utils.data.Dataset):
         self.device = "cuda:0"
         self.dtype = torch.float32
         self.num_imgs = 999999
+        self.frame_cache = None
 
     def __len__(self):
         return self.num_imgs
 
     def __getitem__(self, idx):
-        pass
+        return self.upload_frame(*self.load_frame(idx))
+
+    def load_frame(self, idx):
+        """Decode frame idx on the host as (uint8 HxWx3 image, depth or None, 4x4 pose)"""
+        raise NotImplementedError
+
+    def decode_frame(self, idx):
+        """Decoded, undistorted arrays of frame idx, as stored in the frame cache"""
+        raise NotImplementedError
+
+    def frame_arrays(self, idx):
+        """Arrays of frame idx, memory-mapped from the frame cache when it is open"""
+        if self.frame_cache is None:
+            return self.decode_frame(idx)
+        return {name: stream[idx] for name, stream in self.frame_cache.items()}
+
+    def frame_cache_header(self):
+        """Calibration-dependent identity of the frame cache; any change rebuilds it"""
+        calibration = self.config["Dataset"]["Calibration"]
+        sources = [self.color_paths] + [
+            getattr(self, name) for name in ("color_paths_r", "depth_paths") if hasattr(self, name)
+        ]
+        key = json.dumps([FRAME_CACHE_VERSION, calibration, sources], sort_keys=True, default=str)
+        return {
+            "version": FRAME_CACHE_VERSION,
+            "key": hashlib.sha256(key.encode()).hexdigest(),
+            "num_frames": self.num_imgs,
+            "width": self.width,
+            "height": self.height,
+            "fx": self.fx,
+            "fy": self.fy,
+            "cx": self.cx,
+            "cy": self.cy,
+            "calibration": calibration,
+        }
+
+    def open_frame_cache(self):
+        """
+        Read frames from the memory-mapped cache named by Dataset.frame_cache
+        (True for <dataset_path>/frame_cache, or a directory), building it first
+        if it is missing or was built for another calibration or file list
+        """
+        option = self.config["Dataset"].get("frame_cache", False)
+        if not option:
+            return
+        directory = option if isinstance(option, str) else os.path.join(
+            self.config["Dataset"]["dataset_path"], "frame_cache"
+        )
+        header_path = os.path.join(directory, "header.json")
+        header = self.frame_cache_header()
+        try:
+            with open(header_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = None
+        if cached is None or cached["key"] != header["key"]:
+            Log(f"Building frame cache in {directory}")
+            header["streams"] = self.build_frame_cache(directory, header_path)
+            # For reference only; poses always come from the parser, whose
+            # index tracks the ground-truth file the frame cache does not key on
+            header["poses"] = np.asarray(self.poses).tolist()
+            tmp_path = f"{header_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(header, f, default=str)
+            os.replace(tmp_path, header_path)
+            cached = header
+
+        # Copy-on-write maps: zero-copy reads that torch can still wrap
+        self.frame_cache = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="c")
+            for name in cached["streams"]
+        }
+
+    def build_frame_cache(self, directory, header_path):
+        os.makedirs(directory, exist_ok=True)
+        # A half-written cache must not look valid
+        if os.path.exists(header_path):
+            os.remove(header_path)
+
+        first = self.decode_frame(0)
+        streams = {
+            name: np.lib.format.open_memmap(
+                os.path.join(directory, f"{name}.npy"),
+                mode="w+",
+                dtype=array.dtype,
+                shape=(self.num_imgs,) + array.shape,
+            )
+            for name, array in first.items()
+        }
+        for name, array in first.items():
+            streams[name][0] = array
+        with ThreadPoolExecutor() as executor:
+            for idx, arrays in enumerate(executor.map(self.decode_frame, range(1, self.num_imgs)), 1):
+                for name, array in arrays.items():
+                    streams[name][idx] = array
+        for stream in streams.values():
+            stream.flush()
+        return sorted(streams)
+
+    def upload_frame(self, image, depth, pose):
+        """Move a decoded frame to the device; the uint8 to float conversion runs there"""
+        image = torch.as_tensor(image).to(device=self.device, non_blocking=True)
+        image = image.permute(2, 0, 1).to(dtype=self.dtype) / 255.0
+        pose = torch.as_tensor(pose).to(device=self.device)
+        return image, depth, pose
 
 
 class MonocularDataset(BaseDataset):
@@ -254,27 +480,27 @@ class MonocularDataset(BaseDataset):
             },
         }
 
-    def __getitem__(self, idx):
-        color_path = self.color_paths[idx]
+    def decode_frame(self, idx):
+        image = np.array(Image.open(self.color_paths[idx]))
+        if self.disorted:
+            image = cv2.remap(image, self.map1x, self.map1y, cv2.INTER_LINEAR)
+        arrays = {"color": image}
+
+        if self.has_depth:
+            # Raw sensor values; scaled on read so the cache stays exact
+            arrays["depth"] = np.array(Image.open(self.depth_paths[idx]))
+        return arrays
+
+    def load_frame(self, idx):
+        arrays = self.frame_arrays(idx)
         pose = self.poses[idx]
 
-        image = np.array(Image.open(color_path))
+        image = arrays["color"]
         depth = None
 
-        if self.disorted:
-            image = cv2.remap(image, self.map1x, self.map1y, cv2.INTER_LINEAR)
-
         if self.has_depth:
-            depth_path = self.depth_paths[idx]
-            depth = np.array(Image.open(depth_path)) / self.depth_scale
+            depth = arrays["depth"] / self.depth_scale
 
-        image = (
-            torch.from_numpy(image / 255.0)
-            .clamp(0.0, 1.0)
-            .permute(2, 0, 1)
-            .to(device=self.device, dtype=self.dtype)
-        )
-        pose = torch.from_numpy(pose).to(device=self.device)
         return image, depth, pose
 
 
@@ -362,33 +588,89 @@ class StereoDataset(BaseDataset):
             cv2.CV_32FC1,
         )
 
-    def __getitem__(self, idx):
-        color_path = self.color_paths[idx]
-        color_path_r = self.color_paths_r[idx]
+        # Depth is baseline*fx / disparity on the rectified pair; configs without
+        # a baseline (metres) keep the EuRoC value of the former constant
+        self.baseline = calibration.get("baseline", EUROC_BASELINE)
+        self.baseline_fx = self.baseline * self.fx
+        self.stereo_params = dict(
+            DEFAULT_STEREO_PARAMS, **config["Dataset"].get("stereo_matcher", {})
+        )
+        # One matcher per decoding thread; SGBM keeps per-call scratch buffers
+        self.matchers = threading.local()
+
+        # Cached disparities depend on the rectification and the matcher only
+        self.depth_cache = None
+        option = config["Dataset"].get("depth_cache", False)
+        if option:
+            root = option if isinstance(option, str) else os.path.join(
+                config["Dataset"]["dataset_path"], "depth_cache"
+            )
+            key = json.dumps(
+                [DEPTH_CACHE_VERSION, calibration, self.stereo_params],
+                sort_keys=True,
+                default=str,
+            )
+            self.depth_cache = os.path.join(
+                root, hashlib.sha256(key.encode()).hexdigest()[:16]
+            )
 
-        pose = self.poses[idx]
-        image = cv2.imread(color_path, 0)
-        image_r = cv2.imread(color_path_r, 0)
-        depth = None
+    def stereo_matcher(self):
+        matcher = getattr(self.matchers, "sgbm", None)
+        if matcher is None:
+            matcher = cv2.StereoSGBM_create(
+                minDisparity=self.stereo_params["min_disparity"],
+                numDisparities=self.stereo_params["num_disparities"],
+                blockSize=self.stereo_params["block_size"],
+            )
+            matcher.setUniquenessRatio(self.stereo_params["uniqueness_ratio"])
+            self.matchers.sgbm = matcher
+        return matcher
+
+    def depth_cache_path(self, idx):
+        # Keyed by the frame's timestamp, so start_idx does not shift entries
+        name = os.path.splitext(os.path.basename(self.color_paths[idx]))[0]
+        return os.path.join(self.depth_cache, f"{name}.npy")
+
+    def stereo_disparity(self, idx, image, image_r):
+        """SGBM disparity of frame idx in 1/16 pixels, from the depth cache when present"""
+        if self.depth_cache is None:
+            return self.stereo_matcher().compute(image, image_r)
+
+        path = self.depth_cache_path(idx)
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            pass
+        disparity = self.stereo_matcher().compute(image, image_r)
+        os.makedirs(self.depth_cache, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, disparity)
+        os.replace(tmp_path, path)
+        return disparity
+
+    def decode_frame(self, idx):
+        image = cv2.imread(self.color_paths[idx], 0)
+        image_r = cv2.imread(self.color_paths_r[idx], 0)
         if self.disorted:
             image = cv2.remap(image, self.map1x, self.map1y, cv2.INTER_LINEAR)
             image_r = cv2.remap(image_r, self.map1x_r, self.map1y_r, cv2.INTER_LINEAR)
-        stereo = cv2.StereoSGBM_create(minDisparity=0, numDisparities=64, blockSize=20)
-        stereo.setUniquenessRatio(40)
-        disparity = stereo.compute(image, image_r) / 16.0
+        return {"color": image, "color_r": image_r}
+
+    def load_frame(self, idx):
+        arrays = self.frame_arrays(idx)
+
+        pose = self.poses[idx]
+        image = arrays["color"]
+        image_r = arrays["color_r"]
+        depth = None
+        disparity = self.stereo_disparity(idx, image, image_r) / 16.0
         disparity[disparity == 0] = 1e10
-        depth = 47.90639384423901 / (
+        depth = self.baseline_fx / (
             disparity
         )  ## Following ORB-SLAM2 config, baseline*fx
         depth[depth < 0] = 0
         image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
-        image = (
-            torch.from_numpy(image / 255.0)
-            .clamp(0.0, 1.0)
-            .permute(2, 0, 1)
-            .to(device=self.device, dtype=self.dtype)
-        )
-        pose = torch.from_numpy(pose).to(device=self.device)
 
         return image, depth, pose
 
@@ -402,6 +684,7 @@ class TUMDataset(MonocularDataset):
         self.color_paths = parser.color_paths
         self.depth_paths = parser.depth_paths
         self.poses = parser.poses
+        self.open_frame_cache()
 
 
 class ReplicaDataset(MonocularDataset):
@@ -413,6 +696,7 @@ class ReplicaDataset(MonocularDataset):
         self.color_paths = parser.color_paths
         self.depth_paths = parser.depth_paths
         self.poses = parser.poses
+        self.open_frame_cache()
 
 
 class EurocDataset(StereoDataset):
@@ -424,6 +708,7 @@ class EurocDataset(StereoDataset):
         self.color_paths = parser.color_paths
         self.color_paths_r = parser.color_paths_r
         self.poses = parser.poses
+        self.open_frame_cache()
 
 
 class RealsenseDataset(BaseDataset):
@@ -519,6 +804,98 @@ class RealsenseDataset(BaseDataset):
         return image, depth, pose
 
 
+class FramePrefetcher:
+    """
+    Decodes the next frames of a dataset on worker threads while the current
+    one is tracked. Indexing returns what dataset[idx] would; frames are read
+    into pinned host buffers and copied to the device asynchronously.
+
+    Args:
+        dataset: Dataset implementing load_frame/upload_frame
+        depth: Number of frames decoded ahead of the requested one, 0 disables
+        workers: Decoding threads
+    """
+
+    def __init__(self, dataset, depth=4, workers=2):
+        self.dataset = dataset
+        self.depth = 0 if isinstance(dataset, RealsenseDataset) else depth
+        self.executor = ThreadPoolExecutor(workers) if self.depth > 0 else None
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getattr__(self, name):
+        # Intrinsics and the rest of the dataset interface
+        return getattr(self.dataset, name)
+
+    def _load(self, idx):
+        image, depth, pose = self.dataset.load_frame(idx)
+        image = torch.from_numpy(np.ascontiguousarray(image)).pin_memory()
+        return image, depth, pose
+
+    def __getitem__(self, idx):
+        if self.executor is None:
+            return self.dataset[idx]
+        future = self.pending.pop(idx, None)
+        if future is None:
+            future = self.executor.submit(self._load, idx)
+        for stale in [i for i in self.pending if i < idx]:
+            self.pending.pop(stale).cancel()
+        for ahead in range(idx + 1, min(idx + 1 + self.depth, len(self.dataset))):
+            if ahead not in self.pending:
+                self.pending[ahead] = self.executor.submit(self._load, ahead)
+        return self.dataset.upload_frame(*future.result())
+
+    def close(self):
+        if self.executor is not None:
+            for future in self.pending.values():
+                future.cancel()
+            self.pending.clear()
+            self.executor.shutdown(wait=False)
+
+
+_precompute_dataset = None
+
+
+def _precompute_init(config):
+    global _precompute_dataset
+    # Parallelism comes from the pool; keep OpenCV to one thread per worker
+    cv2.setNumThreads(1)
+    _precompute_dataset = load_dataset(None, None, config)
+
+
+def _precompute_frame(idx):
+    arrays = _precompute_dataset.frame_arrays(idx)
+    _precompute_dataset.stereo_disparity(idx, arrays["color"], arrays["color_r"])
+
+
+def precompute_stereo_depth(config, workers=None):
+    """
+    Fill the stereo depth cache of a sequence across a process pool
+
+    Args:
+        config: SLAM config of a stereo dataset with Dataset.depth_cache set
+        workers: Pool size, defaults to the CPU count
+
+    Returns:
+        Number of frames whose disparity was computed
+    """
+    dataset = load_dataset(None, None, config)
+    if not isinstance(dataset, StereoDataset) or dataset.depth_cache is None:
+        raise ValueError("Depth precompute needs a stereo dataset with Dataset.depth_cache")
+    missing = [
+        idx for idx in range(len(dataset)) if not os.path.exists(dataset.depth_cache_path(idx))
+    ]
+    Log(f"Computing {len(missing)} of {len(dataset)} disparities into {dataset.depth_cache}")
+    with ProcessPoolExecutor(
+        workers, initializer=_precompute_init, initargs=(config,)
+    ) as executor:
+        for _ in executor.map(_precompute_frame, missing, chunksize=16):
+            pass
+    return len(missing)
+
+
 def load_dataset(args, path, config):
     if config["Dataset"]["type"] == "tum":
         return TUMDataset(args, path, config)
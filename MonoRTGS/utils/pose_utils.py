@@ -1,5 +1,6 @@
 import numpy as np
 import torch
+from torch import nn
 
 
 def rt2mat(R, T):
@@ -10,67 +11,90 @@ def rt2mat(R, T):
 
 
 def skew_sym_mat(x):
-    device = x.device
-    dtype = x.dtype
-    ssm = torch.zeros(3, 3, device=device, dtype=dtype)
-    ssm[0, 1] = -x[2]
-    ssm[0, 2] = x[1]
-    ssm[1, 0] = x[2]
-    ssm[1, 2] = -x[0]
-    ssm[2, 0] = -x[1]
-    ssm[2, 1] = x[0]
-    return ssm
+    return skew_sym_mat_batch(x[None])[0]
 
 
-def SO3_exp(theta):
-    device = theta.device
-    dtype = theta.dtype
+def skew_sym_mat_batch(x):
+    """(N, 3) vectors -> (N, 3, 3) skew-symmetric matrices"""
+    zero = torch.zeros_like(x[:, 0])
+    return torch.stack(
+        [zero, -x[:, 2], x[:, 1], x[:, 2], zero, -x[:, 0], -x[:, 1], x[:, 0], zero],
+        dim=-1,
+    ).view(-1, 3, 3)
+
 
-    W = skew_sym_mat(theta)
+def _exp_terms(theta):
+    """
+    Shared terms of the SO(3) exponential and its left Jacobian
+
+    Returns W, W @ W, the (N, 1, 1) rotation angle, the small-angle mask and
+    the angle with small entries replaced by 1, so that the divisions of the
+    branch torch.where discards stay finite, gradients included.
+    """
+    W = skew_sym_mat_batch(theta)
     W2 = W @ W
-    angle = torch.norm(theta)
-    I = torch.eye(3, device=device, dtype=dtype)
-    if angle < 1e-5:
-        return I + W + 0.5 * W2
-    else:
-        return (
-            I
-            + (torch.sin(angle) / angle) * W
-            + ((1 - torch.cos(angle)) / (angle**2)) * W2
-        )
+    angle = torch.norm(theta, dim=-1)[:, None, None]
+    small = angle < 1e-5
+    safe_angle = torch.where(small, torch.ones_like(angle), angle)
+    return W, W2, angle, small, safe_angle
+
+
+def SO3_exp(theta):
+    return SO3_exp_batch(theta[None])[0]
+
+
+def SO3_exp_batch(theta):
+    """(N, 3) rotation vectors -> (N, 3, 3) rotation matrices, without host syncs"""
+    W, W2, angle, small, safe_angle = _exp_terms(theta)
+    I = torch.eye(3, device=theta.device, dtype=theta.dtype)
+    a = torch.where(small, torch.ones_like(angle), torch.sin(safe_angle) / safe_angle)
+    b = torch.where(
+        small,
+        torch.full_like(angle, 0.5),
+        (1 - torch.cos(safe_angle)) / (safe_angle**2),
+    )
+    return I + a * W + b * W2
 
 
 def V(theta):
-    dtype = theta.dtype
-    device = theta.device
-    I = torch.eye(3, device=device, dtype=dtype)
-    W = skew_sym_mat(theta)
-    W2 = W @ W
-    angle = torch.norm(theta)
-    if angle < 1e-5:
-        V = I + 0.5 * W + (1.0 / 6.0) * W2
-    else:
-        V = (
-            I
-            + W * ((1.0 - torch.cos(angle)) / (angle**2))
-            + W2 * ((angle - torch.sin(angle)) / (angle**3))
-        )
-    return V
+    return V_batch(theta[None])[0]
+
+
+def V_batch(theta):
+    """(N, 3) rotation vectors -> (N, 3, 3) left Jacobians of SO(3)"""
+    W, W2, angle, small, safe_angle = _exp_terms(theta)
+    I = torch.eye(3, device=theta.device, dtype=theta.dtype)
+    a = torch.where(
+        small,
+        torch.full_like(angle, 0.5),
+        (1.0 - torch.cos(safe_angle)) / (safe_angle**2),
+    )
+    b = torch.where(
+        small,
+        torch.full_like(angle, 1.0 / 6.0),
+        (safe_angle - torch.sin(safe_angle)) / (safe_angle**3),
+    )
+    return I + a * W + b * W2
 
 
 def SE3_exp(tau):
-    dtype = tau.dtype
-    device = tau.device
+    return SE3_exp_batch(tau[None])[0]
+
 
-    rho = tau[:3]
-    theta = tau[3:]
-    R = SO3_exp(theta)
-    t = V(theta) @ rho
+def SE3_exp_batch(tau):
+    """(N, 6) twists (rho, theta) -> (N, 4, 4) transforms, without host syncs"""
+    rho = tau[:, :3]
+    theta = tau[:, 3:]
+    R = SO3_exp_batch(theta)
+    t = (V_batch(theta) @ rho[..., None])[..., 0]
+    return rt_to_mat_batch(R, t)
 
-    T = torch.eye(4, device=device, dtype=dtype)
-    T[:3, :3] = R
-    T[:3, 3] = t
-    return T
+
+def rt_to_mat_batch(R, T):
+    """(N, 3, 3) rotations and (N, 3) translations -> (N, 4, 4) transforms"""
+    bottom = torch.zeros(R.shape[0], 1, 4, device=R.device, dtype=R.dtype)
+    bottom[:, 0, 3] = 1
+    return torch.cat([torch.cat([R, T[..., None]], dim=-1), bottom], dim=1)
 
 
 def update_pose(camera, converged_threshold=1e-4):
@@ -91,3 +115,59 @@ def update_pose(camera, converged_threshold=1e-4):
     camera.cam_rot_delta.data.fill_(0)
     camera.cam_trans_delta.data.fill_(0)
     return converged
+
+
+class KeyframePoseWindow:
+    """
+    World-to-camera poses of the pose-optimized keyframes, packed
+
+    The (K, 4, 4) poses and the (K, 3) rotation and translation deltas
+    (one parameter each, so they keep their own learning rates) are updated
+    with one batched exponential per iteration. The cameras' R and T are
+    views into the packed poses.
+    """
+
+    def __init__(self, cameras):
+        self.cameras = list(cameras)
+        self.rows = {camera.uid: k for k, camera in enumerate(self.cameras)}
+        if self.cameras:
+            R = torch.stack([camera.R for camera in self.cameras])
+            T = torch.stack([camera.T for camera in self.cameras])
+            self.w2c = rt_to_mat_batch(R, T)
+        else:
+            self.w2c = torch.zeros(0, 4, 4)
+        self.rot_delta = nn.Parameter(torch.zeros_like(self.w2c[:, 0, :3]))
+        self.trans_delta = nn.Parameter(torch.zeros_like(self.w2c[:, 0, :3]))
+
+    def deltas(self, camera):
+        """(theta, rho) to render camera with; its own deltas outside the window"""
+        k = self.rows.get(camera.uid)
+        if k is None:
+            return camera.cam_rot_delta, camera.cam_trans_delta
+        return self.rot_delta[k], self.trans_delta[k]
+
+    def param_groups(self, rot_lr, trans_lr):
+        return [
+            {"params": [self.rot_delta], "lr": rot_lr, "name": "rot_window"},
+            {"params": [self.trans_delta], "lr": trans_lr, "name": "trans_window"},
+        ]
+
+    @torch.no_grad()
+    def update(self, converged_threshold=1e-4):
+        """
+        Apply and reset the deltas of every camera in the window at once
+
+        Returns:
+            (K,) bool tensor, True where a camera's update was below the
+            threshold; left on the device so the caller decides when to sync
+        """
+        tau = torch.cat([self.trans_delta, self.rot_delta], dim=1)
+        converged = tau.norm(dim=1) < converged_threshold
+        if not self.cameras:
+            return converged
+        self.w2c = SE3_exp_batch(tau) @ self.w2c
+        for camera, w2c in zip(self.cameras, self.w2c):
+            camera.update_RT(w2c[0:3, 0:3], w2c[0:3, 3])
+        self.rot_delta.zero_()
+        self.trans_delta.zero_()
+        return converged
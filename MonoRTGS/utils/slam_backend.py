@@ -9,7 +9,7 @@ from gaussian_splatting.gaussian_renderer import render
 from gaussian_splatting.utils.loss_utils import l1_loss, ssim
 from utils.logging_utils import Log
 from utils.multiprocessing_utils import clone_obj
-from utils.pose_utils import update_pose
+from utils.pose_utils import KeyframePoseWindow
 from utils.slam_utils import get_loss_mapping
 
 
@@ -37,6 +37,7 @@ class BackEnd(mp.Process):
         self.current_window = []
         self.initialized = not self.monocular
         self.keyframe_optimizers = None
+        self.pose_window = None
 
     def set_hyperparams(self):
         self.save_results = self.config["Results"]["save_results"]
@@ -84,6 +85,7 @@ class BackEnd(mp.Process):
         self.current_window = []
         self.initialized = not self.monocular
         self.keyframe_optimizers = None
+        self.pose_window = None
 
         # remove all gaussians
         self.gaussians.prune_points(self.gaussians.unique_kfIDs >= 0)
@@ -153,7 +155,6 @@ class BackEnd(mp.Process):
 
         viewpoint_stack = [self.viewpoints[kf_idx] for kf_idx in current_window]
         random_viewpoint_stack = []
-        frames_to_optimize = self.config["Training"]["pose_window"]
 
         current_window_set = set(current_window)
         for cam_idx, viewpoint in self.viewpoints.items():
@@ -183,8 +184,14 @@ class BackEnd(mp.Process):
             for cam_idx in range(len(current_window_opt)):
                 viewpoint = viewpoint_stack[cam_idx]
                 keyframes_opt.append(viewpoint)
+                theta, rho = self.pose_window.deltas(viewpoint)
                 render_pkg = render(
-                    viewpoint, self.gaussians, self.pipeline_params, self.background
+                    viewpoint,
+                    self.gaussians,
+                    self.pipeline_params,
+                    self.background,
+                    theta=theta,
+                    rho=rho,
                 )
                 (
                     image,
@@ -331,11 +338,7 @@ class BackEnd(mp.Process):
                 self.keyframe_optimizers.step()
                 self.keyframe_optimizers.zero_grad(set_to_none=True)
                 # Pose update
-                for cam_idx in range(min(frames_to_optimize, len(current_window))):
-                    viewpoint = viewpoint_stack[cam_idx]
-                    if viewpoint.uid == 0:
-                        continue
-                    update_pose(viewpoint)
+                self.pose_window.update()
         return gaussian_split
 
     def color_refinement(self):
@@ -452,11 +455,26 @@ class BackEnd(mp.Process):
                             Log("Performing initial BA for initialization")
                         else:
                             iter_per_kf = self.mapping_itr_num
+                    # Poses of the first pose_window keyframes are packed and
+                    # updated together at the end of every map iteration
+                    pose_window = min(
+                        self.config["Training"]["pose_window"], frames_to_optimize
+                    )
+                    self.pose_window = KeyframePoseWindow(
+                        self.viewpoints[kf_idx]
+                        for kf_idx in self.current_window[:pose_window]
+                        if kf_idx != 0
+                    )
+                    opt_params += self.pose_window.param_groups(
+                        self.config["Training"]["lr"]["cam_rot_delta"] * 0.5,
+                        self.config["Training"]["lr"]["cam_trans_delta"] * 0.5,
+                    )
                     for cam_idx in range(len(self.current_window)):
                         if self.current_window[cam_idx] == 0:
                             continue
                         viewpoint = self.viewpoints[current_window[cam_idx]]
-                        if cam_idx < frames_to_optimize:
+                        if pose_window <= cam_idx < frames_to_optimize:
+                            # Initial BA optimizes more deltas than map applies
                             opt_params.append(
                                 {
                                     "params": [viewpoint.cam_rot_delta],
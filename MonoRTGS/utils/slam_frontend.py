@@ -8,10 +8,11 @@ from gaussian_splatting.gaussian_renderer import render
 from gaussian_splatting.utils.graphics_utils import getProjectionMatrix2, getWorld2View2
 from gui import gui_utils
 from utils.camera_utils import Camera
+from utils.dataset import FramePrefetcher
 from utils.eval_utils import eval_ate, save_gaussians
 from utils.logging_utils import Log
 from utils.multiprocessing_utils import clone_obj
-from utils.pose_utils import update_pose
+from utils.pose_utils import rt_to_mat_batch, update_pose
 from utils.slam_utils import get_loss_tracking, get_median_depth
 from memory_monitor import start_memory_monitoring, stop_memory_monitoring
 
@@ -54,6 +55,8 @@ class FrontEnd(mp.Process):
         self.kf_interval = self.config["Training"]["kf_interval"]
         self.window_size = self.config["Training"]["window_size"]
         self.single_thread = self.config["Training"]["single_thread"]
+        self.prefetch_depth = self.config["Dataset"].get("prefetch_depth", 4)
+        self.prefetch_workers = self.config["Dataset"].get("prefetch_workers", 2)
         
         # Add adaptive pruning parameters
         self.enable_adaptive_pruning = self.config["Training"].get("enable_adaptive_pruning", True)
@@ -263,58 +266,65 @@ class FrontEnd(mp.Process):
     ):
         N_dont_touch = 2
         window = [cur_frame_idx] + window
-        # remove frames which has little overlap with the current frame
         curr_frame = self.cameras[cur_frame_idx]
-        to_remove = []
+        candidates = window[N_dont_touch:]
         removed_frame = None
-        for i in range(N_dont_touch, len(window)):
-            kf_idx = window[i]
-            # szymkiewicz–simpson coefficient
-            intersection = torch.logical_and(
-                cur_frame_visibility_filter, occ_aware_visibility[kf_idx]
-            ).count_nonzero()
-            denom = min(
-                cur_frame_visibility_filter.count_nonzero(),
-                occ_aware_visibility[kf_idx].count_nonzero(),
-            )
-            point_ratio_2 = intersection / denom
-            cut_off = (
-                self.config["Training"]["kf_cutoff"]
-                if "kf_cutoff" in self.config["Training"]
-                else 0.4
-            )
-            if not self.initialized:
-                cut_off = 0.4
-            if point_ratio_2 <= cut_off:
-                to_remove.append(kf_idx)
+        if not candidates:
+            return window, removed_frame
+
+        # Overlap ratios and pairwise distances of all candidates in one
+        # batched pass, fetched to the host with a single transfer
+        visibility = torch.stack(
+            [occ_aware_visibility[kf_idx] for kf_idx in candidates]
+        ).bool()
+        cur_visibility = cur_frame_visibility_filter.bool()
+        # szymkiewicz–simpson coefficient
+        intersection = torch.logical_and(visibility, cur_visibility).sum(dim=1)
+        denom = torch.minimum(visibility.sum(dim=1), cur_visibility.sum())
+        point_ratio_2 = intersection / denom
+
+        kfs_CW = rt_to_mat_batch(
+            torch.stack([self.cameras[kf_idx].R for kf_idx in candidates]),
+            torch.stack([self.cameras[kf_idx].T for kf_idx in candidates]),
+        )
+        kfs_WC = torch.linalg.inv(kfs_CW)
+        kf_0_WC = torch.linalg.inv(getWorld2View2(curr_frame.R, curr_frame.T))
+        # dists[i, j] = |t(T_CiCj)|, k[i] = sqrt(|t(T_CiC0)|)
+        dists = torch.norm((kfs_CW[:, None] @ kfs_WC[None])[..., 0:3, 3], dim=-1)
+        k = torch.sqrt(torch.norm((kfs_CW @ kf_0_WC)[:, 0:3, 3], dim=-1))
+        stats = (
+            torch.cat([point_ratio_2[:, None].to(dists.dtype), k[:, None], dists], dim=1)
+            .cpu()
+            .numpy()
+        )
+        point_ratio_2, k, dists = stats[:, 0], stats[:, 1], stats[:, 2:]
 
+        # remove frames which has little overlap with the current frame
+        cut_off = (
+            self.config["Training"]["kf_cutoff"]
+            if "kf_cutoff" in self.config["Training"]
+            else 0.4
+        )
+        if not self.initialized:
+            cut_off = 0.4
+        to_remove = [
+            kf_idx for kf_idx, ratio in zip(candidates, point_ratio_2) if ratio <= cut_off
+        ]
         if to_remove:
             window.remove(to_remove[-1])
             removed_frame = to_remove[-1]
-        kf_0_WC = torch.linalg.inv(getWorld2View2(curr_frame.R, curr_frame.T))
 
         if len(window) > self.config["Training"]["window_size"]:
             # we need to find the keyframe to remove...
-            inv_dist = []
-            for i in range(N_dont_touch, len(window)):
-                inv_dists = []
-                kf_i_idx = window[i]
-                kf_i = self.cameras[kf_i_idx]
-                kf_i_CW = getWorld2View2(kf_i.R, kf_i.T)
-                for j in range(N_dont_touch, len(window)):
-                    if i == j:
-                        continue
-                    kf_j_idx = window[j]
-                    kf_j = self.cameras[kf_j_idx]
-                    kf_j_WC = torch.linalg.inv(getWorld2View2(kf_j.R, kf_j.T))
-                    T_CiCj = kf_i_CW @ kf_j_WC
-                    inv_dists.append(1.0 / (torch.norm(T_CiCj[0:3, 3]) + 1e-6).item())
-                T_CiC0 = kf_i_CW @ kf_0_WC
-                k = torch.sqrt(torch.norm(T_CiC0[0:3, 3])).item()
-                inv_dist.append(k * sum(inv_dists))
+            rows = np.array(
+                [i for i, kf_idx in enumerate(candidates) if kf_idx != removed_frame]
+            )
+            inv_dists = 1.0 / (dists[np.ix_(rows, rows)] + 1e-6)
+            np.fill_diagonal(inv_dists, 0.0)
+            inv_dist = k[rows] * inv_dists.sum(axis=1)
 
             idx = np.argmax(inv_dist)
-            removed_frame = window[N_dont_touch + idx]
+            removed_frame = candidates[rows[idx]]
             window.remove(removed_frame)
 
         return window, removed_frame
@@ -362,6 +372,8 @@ class FrontEnd(mp.Process):
             H=self.dataset.height,
         ).transpose(0, 1)
         projection_matrix = projection_matrix.to(device=self.device)
+        # Frames N+1..N+prefetch_depth are decoded while frame N is tracked
+        frames = FramePrefetcher(self.dataset, self.prefetch_depth, self.prefetch_workers)
         
         Log(f"Starting SLAM processing with {total_frames} frames")
         
@@ -374,7 +386,7 @@ class FrontEnd(mp.Process):
             
             # Initialize with first frame
             Log("Initializing with frame 0")
-            viewpoint = Camera.init_from_dataset(self.dataset, 0, projection_matrix)
+            viewpoint = Camera.init_from_dataset(frames, 0, projection_matrix)
             viewpoint.compute_grad_mask(self.config)
             self.cameras[0] = viewpoint
             
@@ -402,7 +414,7 @@ class FrontEnd(mp.Process):
                 Log(f"Processing frame {cur_frame_idx}/{total_frames}")
                 
                 # Create camera for current frame
-                viewpoint = Camera.init_from_dataset(self.dataset, cur_frame_idx, projection_matrix)
+                viewpoint = Camera.init_from_dataset(frames, cur_frame_idx, projection_matrix)
                 viewpoint.compute_grad_mask(self.config)
                 self.cameras[cur_frame_idx] = viewpoint
                 
@@ -522,6 +534,7 @@ class FrontEnd(mp.Process):
                 
                 # Cleanup
                 self.cleanup(cur_frame_idx)
+            frames.close()
             
             # Calculate total time and average FPS
             total_time = time.time() - start_time
@@ -648,7 +661,7 @@ class FrontEnd(mp.Process):
                     continue
 
                 viewpoint = Camera.init_from_dataset(
-                    self.dataset, cur_frame_idx, projection_matrix
+                    frames, cur_frame_idx, projection_matrix
                 )
                 viewpoint.compute_grad_mask(self.config)
 
@@ -770,3 +783,4 @@ class FrontEnd(mp.Process):
                 elif data[0] == "stop":
                     Log("Frontend Stopped.")
                     break
+        frames.close()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Hardware speedup evaluation of saved Gaussian maps
+Chains point cloud loading, projection, tiling, PE scheduling and the
+latency/energy/area model in-process, for many maps and design points
+
+Usage:
+    python eval.py point_cloud.ply other_run.ply --num-pes 8 16 32 --mode splat --output eval_results.csv
+"""
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from rtgs_sim.scheduler import SCHEDULERS
+from rtgs_sim.simulator import preprocess_workload
+from rtgs_sim.sweep import DEFAULT_POINT, RESULT_COLUMNS, evaluate_design_point, expand_grid
+from transform import load_points, project_3d_to_2d, project_splats
+
+EVAL_COLUMNS = ["point_cloud", "num_gaussians", "num_visible"] + RESULT_COLUMNS
+
+
+def evaluate_point_cloud(point_cloud: str,
+                         points: Sequence[Dict],
+                         mode: str = 'center',
+                         fov: float = 60.0,
+                         camera_distance: float = 10.0,
+                         block: int = 16) -> List[Dict]:
+    """
+    Evaluate one map at design points that share a frame size
+
+    The map is loaded and projected once; the workload arrays go straight
+    into the model for every design point.
+
+    Args:
+        point_cloud: Gaussian .ply or point_cloud.json
+        points: Design points, see DEFAULT_POINT; all with the same width and height
+        mode: 'center' or 'splat' projection, see transform.py
+        fov: Field of view in degrees
+        camera_distance: Distance from camera to scene center
+        block: Rasterizer tile size for splat mode
+
+    Returns:
+        One row with EVAL_COLUMNS per design point
+    """
+    width, height = points[0]["width"], points[0]["height"]
+    cloud = load_points(point_cloud)
+    if mode == 'splat':
+        workload = project_splats(cloud, width, height, fov, camera_distance, block)
+    else:
+        workload = project_3d_to_2d(cloud, width, height, fov, camera_distance)
+    coords, counts = workload.pixel_counts()
+    preprocess = preprocess_workload(workload)
+
+    rows = []
+    for point in points:
+        row = {
+            "point_cloud": point_cloud,
+            "num_gaussians": workload.num_gaussians,
+            "num_visible": workload.num_visible,
+        }
+        row.update(evaluate_design_point(coords, counts, point, preprocess))
+        rows.append(row)
+    return rows
+
+
+def _evaluate_task(task) -> List[Dict]:
+    return evaluate_point_cloud(*task)
+
+
+def run_evaluation(point_clouds: Sequence[str],
+                   grid: Dict[str, Sequence],
+                   mode: str = 'center',
+                   fov: float = 60.0,
+                   camera_distance: float = 10.0,
+                   block: int = 16,
+                   max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Evaluate every map at every point of a parameter grid across a process pool
+
+    One task covers one map and one frame size, so each map is projected
+    once per frame size and only result rows travel back from the workers.
+
+    Args:
+        point_clouds: Gaussian .ply or point_cloud.json files
+        grid: Mapping of parameter name to the values to sweep, see expand_grid
+        mode: 'center' or 'splat' projection
+        fov: Field of view in degrees
+        camera_distance: Distance from camera to scene center
+        block: Rasterizer tile size for splat mode
+        max_workers: Pool size, defaults to the CPU count; 1 runs in-process
+
+    Returns:
+        Result rows ordered by map, then grid order
+    """
+    by_size: Dict[tuple, List[Dict]] = {}
+    for point in expand_grid(grid):
+        by_size.setdefault((point["width"], point["height"]), []).append(point)
+    tasks = [
+        (point_cloud, points, mode, fov, camera_distance, block)
+        for point_cloud in point_clouds
+        for points in by_size.values()
+    ]
+
+    if max_workers == 1 or len(tasks) == 1:
+        results = [_evaluate_task(task) for task in tasks]
+    else:
+        max_workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_evaluate_task, tasks))
+    return [row for rows in results for row in rows]
+
+
+def write_table(rows: List[Dict], output_file: str):
+    """Write evaluation results as one CSV table"""
+    with open(output_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=EVAL_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RTGS hardware speedup evaluation of saved Gaussian maps')
+    parser.add_argument('point_clouds', nargs='+',
+                        help='Gaussian .ply files (GaussianModel.save_ply) or point_cloud.json files')
+    parser.add_argument('--output', default='eval_results.csv', help='Output CSV table')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--fov', type=float, default=60.0, help='Field of view in degrees')
+    parser.add_argument('--camera-distance', type=float, default=10.0, help='Camera distance')
+    parser.add_argument('--mode', choices=['center', 'splat'], default='center',
+                        help='Projection mode, see transform.py')
+    parser.add_argument('--block', type=int, default=16, help='Rasterizer tile size for splat mode')
+    for name, default in DEFAULT_POINT.items():
+        if name == "policy":
+            continue
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, nargs='+',
+                            default=[default], help=f'Values to evaluate (default: {default})')
+    parser.add_argument('--policy', nargs='+', choices=sorted(SCHEDULERS),
+                        default=[DEFAULT_POINT["policy"]], help='PE scheduling policies to evaluate')
+
+    args = parser.parse_args()
+    grid = {name: getattr(args, name) for name in DEFAULT_POINT}
+
+    missing = [path for path in args.point_clouds if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"point cloud not found: {', '.join(missing)}")
+
+    print(f"🧮 Evaluating {len(args.point_clouds)} point clouds at {len(expand_grid(grid))} design points...")
+    rows = run_evaluation(
+        args.point_clouds, grid, args.mode, args.fov, args.camera_distance, args.block, args.workers,
+    )
+
+    for row in rows:
+        print(f"📈 {os.path.basename(row['point_cloud'])}: {row['num_visible']}/{row['num_gaussians']} visible, "
+              f"{row['num_pes']} PEs, {row['policy']}: latency {row['latency_s']:.6g} s, "
+              f"energy {row['energy_pJ']:.6g} pJ, area {row['area_mm2']:.6g} mm²")
+    write_table(rows, args.output)
+    print(f"✅ Saved evaluation results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
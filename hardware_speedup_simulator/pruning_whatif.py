@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Pruning-ratio what-if analysis for the RTGS simulator
+
+Scores the Gaussians of a saved map the way GaussianModel.adaptive_pruning
+does, prunes them at several target reduction ratios and runs every pruned
+set through projection and the latency/energy model in one pass, giving a
+speedup-versus-ratio curve without rerunning SLAM.
+
+Usage:
+    python pruning_whatif.py point_cloud.ply --ratios 0.1 0.3 0.5 0.7 --mode splat --plot pruning.png
+"""
+
+import argparse
+import csv
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from rtgs_sim.config import DEFAULT_HARDWARE, HardwareConfig
+from rtgs_sim.scheduler import SCHEDULERS
+from rtgs_sim.simulator import RenderConfig, simulate_workload
+from transform import load_points, project_3d_to_2d, project_splats
+
+CURVE_COLUMNS = [
+    "ratio",
+    "num_gaussians",
+    "num_visible",
+    "preprocessing_s",
+    "rendering_s",
+    "latency_s",
+    "energy_pJ",
+    "speedup",
+    "energy_reduction",
+]
+
+
+def pruning_scores(points: np.ndarray,
+                   n_obs: Optional[np.ndarray] = None,
+                   seed: int = 0) -> np.ndarray:
+    """
+    Removal score of every Gaussian, as in GaussianModel.adaptive_pruning
+
+    0.4 * (1 - opacity) + 0.3 * |scale norm - median| / median
+    + 0.2 * (1 - n_obs / max n_obs) + 0.1 * uniform noise; higher scores are
+    removed first.
+
+    Args:
+        points: Structured point array with opacity (logit) and scale_0..2 (log) fields
+        n_obs: Optional per-Gaussian observation counts; a saved PLY does not
+               carry them, in which case the term is skipped as in the model
+        seed: Seed of the random diversity term
+
+    Returns:
+        (N,) float64 scores; Gaussians with missing attributes score +inf
+    """
+    n = points.shape[0]
+    scores = np.zeros(n, dtype=np.float64)
+
+    # 1. Opacity-based score (lower opacity = higher chance to be removed)
+    opacity = 1.0 / (1.0 + np.exp(-points['opacity'].astype(np.float64)))
+    scores += (1.0 - opacity) * 0.4
+
+    # 2. Scale-based score (very small or very large gaussians)
+    scaling = np.exp(np.stack([points[f'scale_{i}'] for i in range(3)], axis=1).astype(np.float64))
+    scale_norms = np.linalg.norm(scaling, axis=1)
+    finite = scale_norms[np.isfinite(scale_norms)]
+    # torch.median returns the lower of the two middle values
+    scale_median = np.partition(finite, (finite.size - 1) // 2)[(finite.size - 1) // 2] if finite.size else 0.0
+    scores += np.abs(scale_norms - scale_median) / (scale_median + 1e-6) * 0.3
+
+    # 3. Observation count score (less observed = higher chance to be removed)
+    if n_obs is not None and n_obs.shape[0] == n:
+        n_obs = n_obs.astype(np.float64)
+        scores += (1.0 - n_obs / (n_obs.max() + 1e-6)) * 0.2
+
+    # 4. Random component for diversity
+    scores += np.random.default_rng(seed).random(n) * 0.1
+    return np.where(np.isnan(scores), np.inf, scores)
+
+
+def removal_order(scores: np.ndarray) -> np.ndarray:
+    """Gaussian indices from first to last removed"""
+    return np.argsort(-scores, kind="stable")
+
+
+def kept_indices(order: np.ndarray, ratio: float) -> np.ndarray:
+    """
+    Gaussians left after pruning to the target reduction ratio
+
+    The target count is int(N * (1 - ratio)), as adaptive_pruning's final
+    target; the top-scored Gaussians are removed. Sets for increasing
+    ratios are nested because the scores are computed once.
+    """
+    n = order.shape[0]
+    target = int(n * (1 - ratio))
+    return np.sort(order[n - target:])
+
+
+def pruning_curve(points: np.ndarray,
+                  ratios: Sequence[float],
+                  render: RenderConfig,
+                  hardware: HardwareConfig = DEFAULT_HARDWARE,
+                  mode: str = 'center',
+                  fov: float = 60.0,
+                  camera_distance: float = 10.0,
+                  block: int = 16,
+                  n_obs: Optional[np.ndarray] = None,
+                  seed: int = 0) -> List[Dict]:
+    """
+    Latency and energy of the map pruned to each ratio
+
+    Args:
+        points: Structured point array of the full map
+        ratios: Target reduction ratios; 0 (the unpruned baseline) is always included
+        render: Frame geometry, tiling and scheduling parameters
+        hardware: Accelerator configuration
+        mode: 'center' or 'splat' projection, see transform.py
+        fov: Field of view in degrees
+        camera_distance: Distance from camera to scene center
+        block: Rasterizer tile size for splat mode
+        n_obs: Optional per-Gaussian observation counts
+        seed: Seed of the random scoring term
+
+    Returns:
+        One row per ratio (ascending) with CURVE_COLUMNS
+    """
+    order = removal_order(pruning_scores(points, n_obs, seed))
+    rows = []
+    for ratio in sorted(set([0.0] + [float(r) for r in ratios])):
+        pruned = points[kept_indices(order, ratio)]
+        if mode == 'splat':
+            workload = project_splats(pruned, render.width, render.height, fov, camera_distance, block)
+        else:
+            workload = project_3d_to_2d(pruned, render.width, render.height, fov, camera_distance)
+        result = simulate_workload(workload, render, hardware)
+        rows.append({
+            "ratio": ratio,
+            "num_gaussians": workload.num_gaussians,
+            "num_visible": workload.num_visible,
+            "preprocessing_s": result.latency.preprocessing_s,
+            "rendering_s": result.latency.rendering_s,
+            "latency_s": result.latency_s,
+            "energy_pJ": result.energy_pJ,
+        })
+
+    baseline = rows[0]
+    for row in rows:
+        row["speedup"] = baseline["latency_s"] / row["latency_s"]
+        row["energy_reduction"] = 1 - row["energy_pJ"] / baseline["energy_pJ"]
+    return rows
+
+
+def plot_curve(rows: List[Dict], output_file: str):
+    """Save the speedup and energy-reduction curves as an image"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    ratios = [row["ratio"] for row in rows]
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.plot(ratios, [row["speedup"] for row in rows], marker="o", label="speedup")
+    ax.set_xlabel("Target reduction ratio")
+    ax.set_ylabel("Speedup over unpruned map")
+    ax2 = ax.twinx()
+    ax2.plot(ratios, [row["energy_reduction"] for row in rows], marker="s", color="tab:orange",
+             label="energy reduction")
+    ax2.set_ylabel("Energy reduction")
+    fig.legend(loc="upper left")
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=150)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Speedup of the RTGS model versus Gaussian pruning ratio')
+    parser.add_argument('input', help='Gaussian .ply (GaussianModel.save_ply) or point_cloud.json')
+    parser.add_argument('--ratios', type=float, nargs='+', default=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7],
+                        help='Target reduction ratios')
+    parser.add_argument('--output', default='pruning_curve.csv', help='Output CSV curve')
+    parser.add_argument('--plot', help='Optional image of the curve')
+    parser.add_argument('--n-obs', help='Optional .npy with per-Gaussian observation counts')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random scoring term')
+    parser.add_argument('--width', type=int, default=1752, help='Output image width')
+    parser.add_argument('--height', type=int, default=1160, help='Output image height')
+    parser.add_argument('--fov', type=float, default=60.0, help='Field of view in degrees')
+    parser.add_argument('--camera-distance', type=float, default=10.0, help='Camera distance')
+    parser.add_argument('--mode', choices=['center', 'splat'], default='center',
+                        help='Projection mode, see transform.py')
+    parser.add_argument('--block', type=int, default=16, help='Rasterizer tile size for splat mode')
+    parser.add_argument('--num-pes', type=int, default=DEFAULT_HARDWARE.num_pes, help='Rendering PEs')
+    parser.add_argument('--policy', choices=sorted(SCHEDULERS), default='greedy',
+                        help='PE scheduling policy')
+
+    args = parser.parse_args()
+    render = RenderConfig(width=args.width, height=args.height, policy=args.policy)
+    hardware = DEFAULT_HARDWARE.with_overrides(num_pes=args.num_pes)
+    n_obs = np.load(args.n_obs) if args.n_obs else None
+
+    print("🔄 Loading point cloud data...")
+    points = load_points(args.input)
+    print(f"📈 Loaded {len(points)} Gaussians")
+
+    print(f"✂️ Pruning at {len(args.ratios)} ratios and simulating...")
+    rows = pruning_curve(
+        points, args.ratios, render, hardware,
+        args.mode, args.fov, args.camera_distance, args.block, n_obs, args.seed,
+    )
+
+    print(f"{'ratio':>6} {'gaussians':>10} {'visible':>9} {'latency_s':>12} {'energy_pJ':>12} {'speedup':>8}")
+    for row in rows:
+        print(f"{row['ratio']:>6.2f} {row['num_gaussians']:>10} {row['num_visible']:>9} "
+              f"{row['latency_s']:>12.6g} {row['energy_pJ']:>12.6g} {row['speedup']:>8.3f}")
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CURVE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"✅ Saved pruning curve to {args.output}")
+    if args.plot:
+        plot_curve(rows, args.plot)
+        print(f"📊 Saved plot to {args.plot}")
+
+
+if __name__ == "__main__":
+    main()
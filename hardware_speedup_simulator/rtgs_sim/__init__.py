@@ -0,0 +1,52 @@
+"""
+RTGS accelerator simulator
+
+    from rtgs_sim import HardwareConfig, RenderConfig, simulate_workload
+    from rtgs_sim.workload_io import load_workload
+
+    result = simulate_workload(load_workload("transformed_data.npz"),
+                               RenderConfig(width=640, height=480),
+                               HardwareConfig(num_pes=32))
+    print(result.latency_s, result.energy_pJ)
+"""
+
+from rtgs_sim.config import DEFAULT_HARDWARE, HardwareConfig
+from rtgs_sim.model import (
+    AreaBreakdown,
+    EnergyBreakdown,
+    LatencyBreakdown,
+    UnitCosts,
+    accelerator_area,
+    area_breakdown,
+    energy_table,
+    frame_energy,
+    frame_latency,
+    unit_costs,
+)
+from rtgs_sim.simulator import (
+    DEFAULT_RENDER,
+    FrameResult,
+    RenderConfig,
+    simulate_counts,
+    simulate_workload,
+)
+
+__all__ = [
+    "DEFAULT_HARDWARE",
+    "HardwareConfig",
+    "AreaBreakdown",
+    "EnergyBreakdown",
+    "LatencyBreakdown",
+    "UnitCosts",
+    "accelerator_area",
+    "area_breakdown",
+    "energy_table",
+    "frame_energy",
+    "frame_latency",
+    "unit_costs",
+    "DEFAULT_RENDER",
+    "FrameResult",
+    "RenderConfig",
+    "simulate_counts",
+    "simulate_workload",
+]
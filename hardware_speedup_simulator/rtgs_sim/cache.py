@@ -0,0 +1,135 @@
+"""
+On-disk cache of intermediate simulator artifacts
+Each stage is keyed by a content hash of the workload and the parameters
+that affect it, so reruns only recompute stages whose inputs changed
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+from collections import Counter
+from dataclasses import asdict
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from rtgs_sim.simulator import RenderConfig, frame_count_map, frame_tile_stats
+from rtgs_sim.tile_workload import TileStats
+
+# Bump when a stage's output format or semantics change
+CACHE_VERSION = 1
+
+# RenderConfig fields each stage depends on
+COUNT_MAP_PARAMETERS = ("width", "height", "tile_size_1", "tile_size_2")
+TILE_STATS_PARAMETERS = COUNT_MAP_PARAMETERS + ("downsample_stride", "group")
+
+_HASH_BLOCK = 1 << 20
+
+
+def _update_hash(digest, path: str):
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+
+
+def workload_hash(path: str) -> str:
+    """
+    Content hash of a workload file or sequence directory
+
+    Directories hash the names and contents of their frame files in frame
+    order, so renaming or editing any frame changes the hash.
+    """
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.startswith("frame_") and name.endswith((".npz", ".json")):
+                digest.update(name.encode())
+                _update_hash(digest, os.path.join(path, name))
+    else:
+        _update_hash(digest, path)
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Directory of cached stage outputs, one .npz per stage and key
+
+    Args:
+        directory: Cache root; created on first write
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def _path(self, stage: str, params: Dict) -> str:
+        key = json.dumps([CACHE_VERSION, stage, params], sort_keys=True, default=str)
+        name = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.directory, stage, name + ".npz")
+
+    def get(self, stage: str, params: Dict) -> Optional[Dict[str, np.ndarray]]:
+        """Cached arrays of a stage, or None on a miss"""
+        path = self._path(stage, params)
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            # Missing, or truncated by an interrupted run
+            self.misses[stage] += 1
+            return None
+        self.hits[stage] += 1
+        return arrays
+
+    def put(self, stage: str, params: Dict, arrays: Dict[str, np.ndarray]):
+        """Store the arrays of a stage; written atomically"""
+        path = self._path(stage, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+
+    def summary(self) -> str:
+        """One-line hit/miss count per stage"""
+        stages = sorted(set(self.hits) | set(self.misses))
+        return ", ".join(f"{stage}: {self.hits[stage]} hit / {self.misses[stage]} miss" for stage in stages)
+
+
+def cached_tile_stats(cache: StageCache,
+                      source: str,
+                      frame_id: int,
+                      render: RenderConfig,
+                      load_counts: Callable[[], Tuple[np.ndarray, np.ndarray]]) -> TileStats:
+    """
+    Tile statistics of one frame, computed only for stages that miss
+
+    Args:
+        cache: Stage cache
+        source: workload_hash of the workload the frame belongs to
+        frame_id: Frame within the workload
+        render: Tiling parameters of the frame
+        load_counts: Returns the frame's (coords, counts); only called when
+                     the count map is not cached either
+
+    Returns:
+        TileStats of the frame
+    """
+    base = {"source": source, "frame_id": int(frame_id)}
+    stats_params = dict(base, **{name: getattr(render, name) for name in TILE_STATS_PARAMETERS})
+    arrays = cache.get("tile_stats", stats_params)
+    if arrays is not None:
+        return TileStats(**arrays)
+
+    map_params = dict(base, **{name: getattr(render, name) for name in COUNT_MAP_PARAMETERS})
+    arrays = cache.get("count_map", map_params)
+    if arrays is not None:
+        count_map = arrays["count_map"]
+    else:
+        count_map = frame_count_map(*load_counts(), render)
+        cache.put("count_map", map_params, {"count_map": count_map})
+
+    tile_stats = frame_tile_stats(count_map, render)
+    cache.put("tile_stats", stats_params, asdict(tile_stats))
+    return tile_stats
@@ -0,0 +1,76 @@
+"""
+Hardware configuration of the RTGS accelerator
+Every constant the latency, energy and area model uses lives here
+"""
+
+from dataclasses import dataclass, replace
+
+
+@dataclass(frozen=True)
+class HardwareConfig:
+    """
+    Immutable description of one accelerator instance
+
+    Use dataclasses.replace() (or with_overrides()) to derive variants, e.g.
+    replace(DEFAULT_HARDWARE, num_pes=32).
+    """
+    # Clock and parallelism
+    frequency_mhz: float = 500
+    num_pes: int = 16                 # Rendering PEs tiles are scheduled onto
+    resources_guassian: int = 16      # Preprocessing lanes (Gaussians per cycle)
+    resources_pixels: int = 256       # Pixel lanes of the rendering engine
+    gaussian_all: int = 37819         # Gaussians entering preprocessing when the
+                                      # workload does not record its own counts
+
+    # Rendering cycles
+    render_setup_cycles: int = 18
+    render_forward_cycles: int = 12   # Per Gaussian of the critical PE
+    render_backward_cycles: int = 8
+    pixel_pass_cycles: int = 16       # Per pass of resources_pixels samples
+    gmu_cycles: int = 4
+    gmu_dominate: int = 0
+
+    # Preprocessing cycles per unit
+    conv2D_3D_cycles: int = 5
+    conv3D_R_cycles: int = 5
+    R_q_cycles: int = 5
+    conv2D_T_cycles: int = 6
+    T_J_cycles: int = 3
+    J_3D_cycles: int = 9
+    color_SH_cycles: int = 1
+    position2D_3D_cycles: int = 11
+    SH_position_cycles: int = 7
+    preprocess_setup_cycles: int = 2
+    preprocess_fetch_cycles: int = 5  # Per batch of resources_guassian Gaussians
+    duplicate_cycles: int = 1         # Per batch of resources_guassian tile keys
+
+    # Energy per operation (pJ)
+    add_sub_energy: float = 0.25 * 2
+    mul_energy: float = 0.68 * 2
+    exp_energy: float = 2.74 * 2
+    div_energy: float = 2.74 * 2
+    write_SRAM_energy: float = 0.092867 * 16
+    read_SRAM_energy: float = 0.0950 * 16
+
+    # Area per operator (um^2) and SRAM macros
+    add_sub_area: float = 1360
+    mul_area: float = 1640
+    exp_area: float = 13600
+    div_area: float = 13600
+    pow_area: float = 13600
+    sram_area_per_line: float = 706.584  # Per 128-byte line
+    area_scaling: float = 1.6            # Linear technology scaling factor
+    adder_tree_buffer_kb: int = 36
+    global_buffer_kb: int = 161
+    wsu_buffer_kb: int = 6
+
+    @property
+    def cycle_time_s(self) -> float:
+        return 1 / (self.frequency_mhz * 1000000)
+
+    def with_overrides(self, **overrides) -> "HardwareConfig":
+        """Copy of this config with the given fields replaced"""
+        return replace(self, **overrides)
+
+
+DEFAULT_HARDWARE = HardwareConfig()
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+Discrete-event simulator of the RTGS pipeline, alongside the analytical model
+
+Preprocessing stages, rendering PEs and the SRAM buffers between them are
+modelled as servers and bounded FIFOs driven by a heap-based event queue:
+
+    fetch -> [conv2D_3D -> conv3D_R -> R_q]        \\
+          -> [conv2D_T -> T_J -> J_3D]              > gather -> 2D Gaussian buffer
+          -> [color_SH -> SH_position]             /
+          -> [position2D_3D]                      /
+    (sort barrier)
+    dispatch -> PE queues -> PE 0..num_pes-1 -> pixel writeback
+
+Every item flowing through preprocessing is a batch of resources_guassian
+Gaussians; every rendering item is one tile. A stage that finishes while
+any downstream FIFO is full holds its item and stalls until space frees up.
+
+With the default options the event-driven latency reproduces frame_latency()
+exactly, which cross_validate() checks; the options relax the analytical
+assumptions (serialized fetch, unbounded PE queues, free tile dispatch).
+
+Usage:
+    python -m rtgs_sim.event_sim transformed_data.json --fifo-capacity 2 --overlap-fetch
+"""
+
+import argparse
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rtgs_sim.config import DEFAULT_HARDWARE, HardwareConfig
+from rtgs_sim.model import LatencyBreakdown, PreprocessWorkload
+from rtgs_sim.scheduler import SCHEDULERS
+from rtgs_sim.simulator import (
+    DEFAULT_RENDER,
+    FrameResult,
+    RenderConfig,
+    preprocess_workload,
+    simulate_counts,
+)
+from rtgs_sim.workload_io import load_workload
+
+
+@dataclass(frozen=True)
+class EventSimOptions:
+    """Micro-architectural knobs the analytical model does not capture"""
+    fifo_capacity: int = 4                     # Batches per inter-stage FIFO
+    overlap_fetch: bool = False                # Pipeline fetch with the branches
+    pe_queue_capacity: Optional[int] = None    # Tiles queued per PE (None: unbounded)
+    dispatch_cycles: float = 0                 # Cycles to issue one tile to a PE
+    buffer_ports: int = 2                      # SRAM accesses per cycle (1R1W)
+
+
+DEFAULT_EVENT_OPTIONS = EventSimOptions()
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Activity of one pipeline stage over its phase"""
+    name: str
+    items: int
+    busy_cycles: float
+    stall_cycles: float   # Finished but blocked by a full downstream FIFO
+    utilization: float    # busy_cycles / phase cycles
+
+
+@dataclass(frozen=True)
+class BufferStats:
+    """Occupancy and traffic of one FIFO over its phase"""
+    name: str
+    capacity: Optional[int]
+    max_occupancy: int
+    mean_occupancy: float
+    bandwidth_utilization: float  # (pushes + pops) / (ports * phase cycles)
+
+
+@dataclass(frozen=True)
+class EventSimResult:
+    """Outcome of one event-driven frame simulation"""
+    preprocessing_cycles: float
+    rendering_cycles: float
+    stages: List[StageStats]
+    buffers: List[BufferStats]
+    events: int
+
+    @property
+    def total_cycles(self) -> float:
+        return self.preprocessing_cycles + self.rendering_cycles
+
+    def latency(self, config: HardwareConfig = DEFAULT_HARDWARE) -> LatencyBreakdown:
+        return LatencyBreakdown(
+            rendering_s=self.rendering_cycles * config.cycle_time_s,
+            preprocessing_s=self.preprocessing_cycles * config.cycle_time_s,
+        )
+
+
+class _Fifo:
+    """Bounded FIFO with time-weighted occupancy tracking"""
+
+    def __init__(self, name: str, capacity: Optional[int]):
+        self.name = name
+        self.capacity = capacity
+        self.items = deque()
+        self.producer: Optional["_Stage"] = None
+        self.consumer: Optional["_Stage"] = None
+        self.pushes = 0
+        self.pops = 0
+        self.max_occupancy = 0
+        self._area = 0.0
+        self._last = 0.0
+
+    def has_space(self) -> bool:
+        return self.capacity is None or len(self.items) < self.capacity
+
+    def _advance(self, t: float):
+        self._area += len(self.items) * (t - self._last)
+        self._last = t
+
+    def push(self, t: float, item):
+        self._advance(t)
+        self.items.append(item)
+        self.pushes += 1
+        self.max_occupancy = max(self.max_occupancy, len(self.items))
+
+    def pop(self, t: float):
+        self._advance(t)
+        self.pops += 1
+        return self.items.popleft()
+
+    def stats(self, start: float, end: float, ports: int) -> BufferStats:
+        self._advance(end)
+        duration = end - start
+        return BufferStats(
+            name=self.name,
+            capacity=self.capacity,
+            max_occupancy=self.max_occupancy,
+            mean_occupancy=self._area / duration if duration > 0 else 0.0,
+            bandwidth_utilization=(self.pushes + self.pops) / (ports * duration) if duration > 0 else 0.0,
+        )
+
+
+class _Stage:
+    """
+    Single server: takes one item from each input FIFO, holds it for
+    service(item) cycles, then pushes it to every output FIFO (or to the
+    outputs listed by route(item), possibly none). Stages without inputs
+    are sources.
+    """
+
+    def __init__(self,
+                 name: str,
+                 service: Callable[[object], float],
+                 inputs: Sequence[_Fifo] = (),
+                 outputs: Sequence[_Fifo] = (),
+                 source: Optional[Sequence] = None,
+                 route: Optional[Callable[[object], Sequence[int]]] = None):
+        self.name = name
+        self.service = service
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.source = deque(source) if source is not None else None
+        self.route = route
+        for fifo in self.inputs:
+            fifo.consumer = self
+        for fifo in self.outputs:
+            fifo.producer = self
+        self.busy = False
+        self.holding = None
+        self.blocked_since: Optional[float] = None
+        self.items_done = 0
+        self.busy_cycles = 0.0
+        self.stall_cycles = 0.0
+
+    def targets(self, item) -> List[_Fifo]:
+        if self.route is None:
+            return self.outputs
+        return [self.outputs[i] for i in self.route(item)]
+
+
+class _EventEngine:
+    """Heap-ordered event loop over a graph of stages and FIFOs"""
+
+    def __init__(self, stages: List[_Stage], start: float = 0.0):
+        self.stages = stages
+        self.now = start
+        self.heap: List[Tuple[float, int, _Stage]] = []
+        self.seq = 0
+        self.events = 0
+
+    def _schedule(self, t: float, stage: _Stage):
+        heapq.heappush(self.heap, (t, self.seq, stage))
+        self.seq += 1
+
+    def _try_start(self, stage: _Stage):
+        if stage.busy or stage.holding is not None:
+            return
+        if stage.source is not None:
+            if not stage.source:
+                return
+            item = stage.source.popleft()
+        else:
+            if not all(fifo.items for fifo in stage.inputs):
+                return
+            item = None
+            for fifo in stage.inputs:
+                popped = fifo.pop(self.now)
+                item = popped if item is None else item
+        cycles = stage.service(item)
+        stage.busy = True
+        stage.holding = item
+        stage.busy_cycles += cycles
+        self._schedule(self.now + cycles, stage)
+        # Freed FIFO slots may unblock the producers
+        for fifo in stage.inputs:
+            if fifo.producer is not None:
+                self._try_emit(fifo.producer)
+
+    def _try_emit(self, stage: _Stage):
+        if stage.busy or stage.holding is None:
+            return
+        targets = stage.targets(stage.holding)
+        if not all(fifo.has_space() for fifo in targets):
+            if stage.blocked_since is None:
+                stage.blocked_since = self.now
+            return
+        if stage.blocked_since is not None:
+            stage.stall_cycles += self.now - stage.blocked_since
+            stage.blocked_since = None
+        item, stage.holding = stage.holding, None
+        stage.items_done += 1
+        for fifo in targets:
+            fifo.push(self.now, item)
+        for fifo in targets:
+            if fifo.consumer is not None:
+                self._try_start(fifo.consumer)
+        self._try_start(stage)
+
+    def run(self) -> float:
+        """Run until no events remain; returns the time of the last event"""
+        for stage in self.stages:
+            self._try_start(stage)
+        while self.heap:
+            # Pop every event of the current timestamp as one batch so that all
+            # completions are visible before anything downstream restarts
+            self.now = self.heap[0][0]
+            batch = []
+            while self.heap and self.heap[0][0] == self.now:
+                batch.append(heapq.heappop(self.heap)[2])
+            self.events += len(batch)
+            for stage in batch:
+                stage.busy = False
+            for stage in batch:
+                self._try_emit(stage)
+        return self.now
+
+
+def _stage_stats(stages: Sequence[_Stage], start: float, end: float) -> List[StageStats]:
+    duration = end - start
+    return [
+        StageStats(
+            name=stage.name,
+            items=stage.items_done,
+            busy_cycles=stage.busy_cycles,
+            stall_cycles=stage.stall_cycles,
+            utilization=stage.busy_cycles / duration if duration > 0 else 0.0,
+        )
+        for stage in stages
+    ]
+
+
+def _preprocessing_phase(config: HardwareConfig,
+                         options: EventSimOptions,
+                         preprocess: Optional[PreprocessWorkload]) -> Tuple[float, List[StageStats], List[BufferStats], int]:
+    """Event-driven preprocessing of every Gaussian batch"""
+    c = config
+    p = preprocess or PreprocessWorkload.from_config(c)
+    fetch_batches = int(p.loaded / c.resources_guassian) + 1
+    batches = int(p.visible / c.resources_guassian) + 1
+    branches = [
+        [("conv2D_3D", c.conv2D_3D_cycles), ("conv3D_R", c.conv3D_R_cycles), ("R_q", c.R_q_cycles)],
+        [("conv2D_T", c.conv2D_T_cycles), ("T_J", c.T_J_cycles), ("J_3D", c.J_3D_cycles)],
+        [("color_SH", c.color_SH_cycles), ("SH_position", c.SH_position_cycles)],
+        [("position2D_3D", c.position2D_3D_cycles)],
+    ]
+
+    start = float(c.preprocess_setup_cycles)
+    # Without overlap the whole frame is fetched before the branches start,
+    # so the fetch outputs must be able to hold every batch
+    fetch_capacity = options.fifo_capacity if options.overlap_fetch else None
+    branch_inputs = [_Fifo(f"fetch->{branch[0][0]}", fetch_capacity) for branch in branches]
+    # Batches culled by the frustum test are fetched but never enter the branches
+    all_branches = list(range(len(branches)))
+    fetch = _Stage("fetch", lambda _: c.preprocess_fetch_cycles,
+                   outputs=branch_inputs, source=range(fetch_batches),
+                   route=lambda batch: all_branches if batch < batches else [])
+    events = 0
+    if not options.overlap_fetch:
+        # Run the fetch alone before any branch stage is attached to its outputs
+        fetch_engine = _EventEngine([fetch], start)
+        start = fetch_engine.run()
+        events += fetch_engine.events
+
+    fifos: List[_Fifo] = list(branch_inputs)
+    stages: List[_Stage] = [fetch]
+    gather_inputs = []
+    for branch, fifo_in in zip(branches, branch_inputs):
+        for i, (name, cycles) in enumerate(branch):
+            if i + 1 < len(branch):
+                fifo_out = _Fifo(f"{name}->{branch[i + 1][0]}", options.fifo_capacity)
+            else:
+                fifo_out = _Fifo(f"{name}->gather", options.fifo_capacity)
+                gather_inputs.append(fifo_out)
+            fifos.append(fifo_out)
+            stages.append(_Stage(name, lambda _, cycles=cycles: cycles, [fifo_in], [fifo_out]))
+            fifo_in = fifo_out
+
+    gaussian_2d = _Fifo("gaussian_2d", None)
+    fifos.append(gaussian_2d)
+    stages.append(_Stage("gather", lambda _: 0, gather_inputs, [gaussian_2d]))
+
+    engine = _EventEngine(stages if options.overlap_fetch else stages[1:], start)
+    end = engine.run()
+    events += engine.events
+    # Key duplication follows the gather, as in preprocessing_cycles()
+    if p.duplicates is not None:
+        end += c.duplicate_cycles * int(np.ceil(p.duplicates / c.resources_guassian))
+
+    return (
+        end,
+        _stage_stats(stages, 0.0, end),
+        [fifo.stats(0.0, end, options.buffer_ports) for fifo in fifos],
+        events,
+    )
+
+
+def _rendering_phase(tile_times: np.ndarray,
+                     assignment: np.ndarray,
+                     num_pes: int,
+                     width: int,
+                     height: int,
+                     down: int,
+                     config: HardwareConfig,
+                     options: EventSimOptions) -> Tuple[float, List[StageStats], List[BufferStats], int]:
+    """Event-driven rendering of every tile on the PEs it was scheduled to"""
+    c = config
+    tile_cycles = tile_times.ravel().astype(np.float64) * (c.render_forward_cycles + c.render_backward_cycles)
+    start = float(c.render_setup_cycles)
+
+    pe_queues = [_Fifo(f"pe_queue_{pe:02d}", options.pe_queue_capacity) for pe in range(num_pes)]
+    dispatch = _Stage(
+        "dispatch",
+        lambda _: options.dispatch_cycles,
+        outputs=pe_queues,
+        source=range(tile_cycles.shape[0]),
+        route=lambda tile: (assignment[tile],),
+    )
+    pes = [
+        _Stage(f"pe_{pe:02d}", lambda tile: tile_cycles[tile], [queue])
+        for pe, queue in enumerate(pe_queues)
+    ]
+    engine = _EventEngine([dispatch] + pes, start)
+    render_end = engine.run()
+
+    # Pixel writeback and the GMU run after the last PE, as in frame_latency()
+    writeback = c.pixel_pass_cycles * (width * height / (down * down * c.resources_pixels))
+    end = (render_end + writeback) + c.gmu_cycles * c.gmu_dominate
+    return (
+        end,
+        _stage_stats([dispatch] + pes, 0.0, end),
+        [queue.stats(0.0, end, options.buffer_ports) for queue in pe_queues],
+        engine.events,
+    )
+
+
+def simulate_events(tile_times: np.ndarray,
+                    assignment: np.ndarray,
+                    width: int,
+                    height: int,
+                    down: int,
+                    config: HardwareConfig = DEFAULT_HARDWARE,
+                    options: EventSimOptions = DEFAULT_EVENT_OPTIONS,
+                    preprocess: Optional[PreprocessWorkload] = None) -> EventSimResult:
+    """
+    Event-driven simulation of one frame
+
+    Preprocessing and rendering are separated by the depth-sort barrier, so
+    they run as two consecutive phases.
+
+    Args:
+        tile_times: Per-tile Gaussian steps (TileStats.group_max)
+        assignment: PE index per tile in row-major order (ScheduleResult.assignment)
+        width: Image width
+        height: Image height
+        down: Downsample stride inside each tile
+        config: Hardware configuration
+        options: Event simulator options
+        preprocess: Gaussian counts for preprocessing, see preprocessing_cycles
+
+    Returns:
+        EventSimResult with cycle counts and per-stage/per-buffer statistics
+    """
+    pre_cycles, pre_stages, pre_buffers, pre_events = _preprocessing_phase(config, options, preprocess)
+    render_cycles, render_stages, render_buffers, render_events = _rendering_phase(
+        tile_times, assignment, config.num_pes, width, height, down, config, options
+    )
+    return EventSimResult(
+        preprocessing_cycles=pre_cycles,
+        rendering_cycles=render_cycles,
+        stages=pre_stages + render_stages,
+        buffers=pre_buffers + render_buffers,
+        events=pre_events + render_events,
+    )
+
+
+def simulate_counts_events(coords: np.ndarray,
+                           counts: np.ndarray,
+                           render: RenderConfig = DEFAULT_RENDER,
+                           hardware: HardwareConfig = DEFAULT_HARDWARE,
+                           options: EventSimOptions = DEFAULT_EVENT_OPTIONS,
+                           preprocess: Optional[PreprocessWorkload] = None) -> Tuple[FrameResult, EventSimResult]:
+    """Analytical and event-driven simulation of the same frame, see simulate_counts"""
+    frame = simulate_counts(coords, counts, render, hardware, preprocess)
+    events = simulate_events(
+        frame.tile_stats.group_max,
+        frame.schedule.assignment,
+        render.width,
+        render.height,
+        render.downsample_stride,
+        hardware,
+        options,
+        preprocess,
+    )
+    return frame, events
+
+
+def cross_validate(analytical: LatencyBreakdown,
+                   event_result: EventSimResult,
+                   config: HardwareConfig = DEFAULT_HARDWARE) -> Dict[str, float]:
+    """
+    Relative difference of the event-driven latency from the analytical one
+
+    Returns:
+        Dictionary with the rendering, preprocessing and total latency of
+        both models (seconds) and their relative errors
+    """
+    event_latency = event_result.latency(config)
+    report = {}
+    for name in ("rendering_s", "preprocessing_s", "total_s"):
+        expected = getattr(analytical, name)
+        measured = getattr(event_latency, name)
+        report[f"analytical_{name}"] = expected
+        report[f"event_{name}"] = measured
+        report[f"rel_error_{name}"] = abs(measured - expected) / expected if expected else abs(measured)
+    return report
+
+
+def print_report(event_result: EventSimResult, validation: Dict[str, float]):
+    """Print the per-stage, per-buffer and cross-validation tables"""
+    print(f"{'stage':>16} {'items':>8} {'busy':>12} {'stall':>12} {'util':>7}")
+    for s in event_result.stages:
+        print(f"{s.name:>16} {s.items:>8} {s.busy_cycles:>12.6g} {s.stall_cycles:>12.6g} {s.utilization:>7.3f}")
+    print(f"{'buffer':>24} {'cap':>6} {'max':>8} {'mean':>10} {'bw util':>8}")
+    for b in event_result.buffers:
+        cap = "inf" if b.capacity is None else b.capacity
+        print(f"{b.name:>24} {cap:>6} {b.max_occupancy:>8} {b.mean_occupancy:>10.4g} {b.bandwidth_utilization:>8.3f}")
+    for name in ("preprocessing_s", "rendering_s", "total_s"):
+        print(f"🔍 {name[:-2]}: analytical {validation[f'analytical_{name}']:.6g} s, "
+              f"event-driven {validation[f'event_{name}']:.6g} s "
+              f"(rel. error {validation[f'rel_error_{name}']:.2e})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Event-driven RTGS pipeline simulation')
+    parser.add_argument('input', nargs='?', default='transformed_data.json',
+                        help='Input workload file (.npz or legacy .json)')
+    parser.add_argument('--width', type=int, default=DEFAULT_RENDER.width)
+    parser.add_argument('--height', type=int, default=DEFAULT_RENDER.height)
+    parser.add_argument('--num-pes', type=int, default=DEFAULT_HARDWARE.num_pes)
+    parser.add_argument('--policy', choices=sorted(SCHEDULERS), default=DEFAULT_RENDER.policy)
+    parser.add_argument('--fifo-capacity', type=int, default=DEFAULT_EVENT_OPTIONS.fifo_capacity,
+                        help='Batches per preprocessing FIFO')
+    parser.add_argument('--pe-queue-capacity', type=int, default=None,
+                        help='Tiles queued per PE (default: unbounded)')
+    parser.add_argument('--dispatch-cycles', type=float, default=DEFAULT_EVENT_OPTIONS.dispatch_cycles,
+                        help='Cycles to issue one tile')
+    parser.add_argument('--overlap-fetch', action='store_true',
+                        help='Pipeline the Gaussian fetch with the preprocessing branches')
+
+    args = parser.parse_args()
+    render = RenderConfig(width=args.width, height=args.height, policy=args.policy)
+    hardware = DEFAULT_HARDWARE.with_overrides(num_pes=args.num_pes)
+    options = EventSimOptions(
+        fifo_capacity=args.fifo_capacity,
+        overlap_fetch=args.overlap_fetch,
+        pe_queue_capacity=args.pe_queue_capacity,
+        dispatch_cycles=args.dispatch_cycles,
+    )
+
+    print("🔄 Loading workload...")
+    workload = load_workload(args.input, with_indices=False)
+    coords, counts = workload.pixel_counts()
+    frame, event_result = simulate_counts_events(
+        coords, counts, render, hardware, options, preprocess_workload(workload)
+    )
+    print(f"⚙️ Simulated {event_result.events} events")
+    print_report(event_result, cross_validate(frame.latency, event_result, hardware))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Tile-imbalance analytics for the RTGS simulator
+Shows how unevenly rendering work is spread over tiles and PEs
+
+Usage:
+    python -m rtgs_sim.imbalance transformed_data.json --output imbalance.json --heatmap imbalance.png
+"""
+
+import argparse
+import json
+from typing import Dict, Optional
+
+import numpy as np
+
+from rtgs_sim.config import DEFAULT_HARDWARE
+from rtgs_sim.scheduler import SCHEDULERS, ScheduleResult, schedule
+from rtgs_sim.simulator import RenderConfig, simulate_workload
+from rtgs_sim.tile_workload import TileStats
+from rtgs_sim.workload_io import load_workload
+
+
+def gini(values: np.ndarray) -> float:
+    """Gini coefficient of non-negative values (0: perfectly even, ->1: one holds all)"""
+    values = np.sort(np.asarray(values, dtype=np.float64).ravel())
+    n = values.size
+    total = values.sum()
+    if n == 0 or total == 0:
+        return 0.0
+    ranks = np.arange(1, n + 1)
+    return float(2 * np.dot(ranks, values) / (n * total) - (n + 1) / n)
+
+
+def max_mean_ratio(values: np.ndarray) -> float:
+    """Peak-to-average ratio (1: perfectly even)"""
+    values = np.asarray(values, dtype=np.float64)
+    mean = values.mean() if values.size else 0.0
+    return float(values.max() / mean) if mean > 0 else 0.0
+
+
+def imbalance_report(tile_stats: TileStats,
+                     schedule_result: ScheduleResult,
+                     bins: int = 32) -> Dict:
+    """
+    Columnar imbalance report of one frame
+
+    Args:
+        tile_stats: Per-tile workload statistics
+        schedule_result: PE schedule of tile_stats.group_max
+        bins: Histogram bins of the per-tile loads
+
+    Returns:
+        Dictionary with a "summary" of scalars and "tiles", "pes" and
+        "histograms" tables stored as column lists
+    """
+    raw = tile_stats.raw_max
+    grouped = tile_stats.group_max
+    tiles_y, tiles_x = grouped.shape
+    num_pes = schedule_result.pe_loads.shape[0]
+    # Same policy on the unbalanced per-tile maxima isolates the pairing effect
+    raw_schedule = schedule(raw, num_pes, schedule_result.policy)
+
+    # Shared bin edges so the two histograms are directly comparable
+    upper = max(int(raw.max()) if raw.size else 0, 1)
+    raw_counts, edges = np.histogram(raw, bins=bins, range=(0, upper))
+    group_counts, _ = np.histogram(grouped, bins=bins, range=(0, upper))
+
+    pe_tiles = np.bincount(schedule_result.assignment, minlength=num_pes)
+    ty, tx = np.divmod(np.arange(raw.size), tiles_x)
+    summary = {
+        "tiles_y": int(tiles_y),
+        "tiles_x": int(tiles_x),
+        "num_pes": int(num_pes),
+        "policy": schedule_result.policy,
+        "empty_tile_fraction": float(np.mean(grouped == 0)) if grouped.size else 0.0,
+        "tile_gini_raw": gini(raw),
+        "tile_gini_group": gini(grouped),
+        "tile_max_mean_raw": max_mean_ratio(raw),
+        "tile_max_mean_group": max_mean_ratio(grouped),
+        "sum_raw_max": tile_stats.sum_raw_max,
+        "sum_group_max": tile_stats.sum_group_max,
+        "pairing_work_reduction": 1 - tile_stats.sum_group_max / tile_stats.sum_raw_max
+                                  if tile_stats.sum_raw_max else 0.0,
+        "makespan_raw": raw_schedule.makespan,
+        "makespan_group": schedule_result.makespan,
+        "pairing_makespan_reduction": 1 - schedule_result.makespan / raw_schedule.makespan
+                                      if raw_schedule.makespan else 0.0,
+        "pe_gini": gini(schedule_result.pe_loads),
+        "pe_max_mean": max_mean_ratio(schedule_result.pe_loads),
+        "pe_mean_utilization": schedule_result.mean_utilization,
+    }
+    return {
+        "summary": summary,
+        "tiles": {
+            "tile_y": ty.tolist(),
+            "tile_x": tx.tolist(),
+            "raw_max": raw.ravel().tolist(),
+            "avg_max": tile_stats.avg_max.ravel().tolist(),
+            "group_max": grouped.ravel().tolist(),
+            "all_gaussian": tile_stats.all_gaussian.ravel().tolist(),
+            "pe": schedule_result.assignment.tolist(),
+        },
+        "pes": {
+            "pe": list(range(num_pes)),
+            "load": schedule_result.pe_loads.tolist(),
+            "tiles": pe_tiles.tolist(),
+            "utilization": schedule_result.utilization.tolist(),
+        },
+        "histograms": {
+            "bin_edges": edges.tolist(),
+            "raw_max": raw_counts.tolist(),
+            "group_max": group_counts.tolist(),
+        },
+    }
+
+
+def save_report(report: Dict, output_file: str):
+    """Write an imbalance report as one columnar JSON file"""
+    with open(output_file, "w") as f:
+        json.dump(report, f)
+
+
+def save_heatmap(tile_loads: np.ndarray, output_file: str, title: Optional[str] = None):
+    """Save a heatmap PNG of the per-tile load"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    tiles_y, tiles_x = tile_loads.shape
+    fig, ax = plt.subplots(figsize=(max(4, tiles_x / 10), max(3, tiles_y / 10)))
+    image = ax.imshow(tile_loads, cmap="inferno", interpolation="nearest")
+    fig.colorbar(image, ax=ax, label="Gaussian steps per tile")
+    ax.set_xlabel("tile x")
+    ax.set_ylabel("tile y")
+    if title:
+        ax.set_title(title)
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=150)
+    plt.close(fig)
+
+
+def print_summary(summary: Dict):
+    """Print the scalar part of an imbalance report"""
+    print(f"🧱 {summary['tiles_y']}x{summary['tiles_x']} tiles, "
+          f"{summary['empty_tile_fraction']:.1%} empty")
+    print(f"📊 Tile load Gini: raw {summary['tile_gini_raw']:.3f}, grouped {summary['tile_gini_group']:.3f}; "
+          f"max/mean: raw {summary['tile_max_mean_raw']:.2f}, grouped {summary['tile_max_mean_group']:.2f}")
+    print(f"⚖️ Pairing groups cut tile work by {summary['pairing_work_reduction']:.1%} and the "
+          f"makespan by {summary['pairing_makespan_reduction']:.1%} "
+          f"({summary['makespan_raw']} -> {summary['makespan_group']})")
+    print(f"🔧 PE load Gini {summary['pe_gini']:.3f}, max/mean {summary['pe_max_mean']:.2f}, "
+          f"mean utilization {summary['pe_mean_utilization']:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tile and PE imbalance report for one workload')
+    parser.add_argument('input', nargs='?', default='transformed_data.json',
+                        help='Input workload file (.npz or legacy .json)')
+    parser.add_argument('--output', default='imbalance.json', help='Columnar JSON report')
+    parser.add_argument('--heatmap', help='Optional per-tile load heatmap PNG')
+    parser.add_argument('--bins', type=int, default=32, help='Histogram bins')
+    parser.add_argument('--width', type=int, default=1752)
+    parser.add_argument('--height', type=int, default=1160)
+    parser.add_argument('--num-pes', type=int, default=DEFAULT_HARDWARE.num_pes)
+    parser.add_argument('--policy', choices=sorted(SCHEDULERS), default='greedy')
+
+    args = parser.parse_args()
+    workload = load_workload(args.input, with_indices=False)
+    render = RenderConfig(
+        width=workload.width or args.width,
+        height=workload.height or args.height,
+        policy=args.policy,
+    )
+    result = simulate_workload(workload, render, DEFAULT_HARDWARE.with_overrides(num_pes=args.num_pes))
+
+    report = imbalance_report(result.tile_stats, result.schedule, args.bins)
+    print_summary(report["summary"])
+    save_report(report, args.output)
+    print(f"✅ Saved imbalance report to {args.output}")
+    if args.heatmap:
+        save_heatmap(result.tile_stats.group_max, args.heatmap, "Pairing-group load per tile")
+        print(f"🗺️ Saved heatmap to {args.heatmap}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""
+Analytical latency, energy and area model of the RTGS accelerator
+All functions are pure: they only read a HardwareConfig and their arguments
+"""
+
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from rtgs_sim.config import DEFAULT_HARDWARE, HardwareConfig
+
+# Scalars or equally shaped arrays, so one call can cover a whole sweep
+Count = Union[int, np.ndarray]
+
+
+@dataclass(frozen=True)
+class LatencyBreakdown:
+    """Frame latency split into the rendering and preprocessing stages"""
+    rendering_s: float
+    preprocessing_s: float
+
+    @property
+    def total_s(self) -> float:
+        return self.rendering_s + self.preprocessing_s
+
+
+@dataclass(frozen=True)
+class EnergyBreakdown:
+    """Frame energy split into the rendering and preprocessing datapaths and on-chip SRAM traffic"""
+    rendering_pJ: float
+    preprocessing_pJ: float
+    sram_pJ: float
+
+    @property
+    def computing_pJ(self) -> float:
+        return self.rendering_pJ + self.preprocessing_pJ
+
+    @property
+    def total_pJ(self) -> float:
+        return self.computing_pJ + self.sram_pJ
+
+
+@dataclass(frozen=True)
+class PreprocessWorkload:
+    """
+    Gaussians handled by the preprocessing stage of one frame
+
+    loaded Gaussians are fetched and frustum-culled, the visible survivors
+    go through covariance, projection and SH evaluation, and duplicates
+    (tile-Gaussian pairs, the sum of the per-tile counts) are emitted as
+    sort keys. Fields may be arrays to evaluate many workloads at once.
+    """
+    loaded: Count
+    visible: Count
+    duplicates: Optional[Count] = None
+
+    @staticmethod
+    def from_config(config: HardwareConfig = DEFAULT_HARDWARE) -> "PreprocessWorkload":
+        """Legacy assumption: config.gaussian_all Gaussians, all visible"""
+        return PreprocessWorkload(config.gaussian_all, config.gaussian_all)
+
+
+def _batches(count: Count, lanes: int) -> Count:
+    """Preprocessing batches of `lanes` Gaussians, int(count / lanes) + 1"""
+    batches = np.floor(np.asarray(count) / lanes).astype(np.int64) + 1
+    return int(batches) if batches.ndim == 0 else batches
+
+
+def _as_count(value):
+    value = np.asarray(value)
+    return value.item() if value.ndim == 0 else value
+
+
+def preprocessing_cycles(config: HardwareConfig = DEFAULT_HARDWARE,
+                         preprocess: Optional[PreprocessWorkload] = None) -> Count:
+    """
+    Cycles of the preprocessing stage
+
+    Args:
+        config: Hardware configuration
+        preprocess: Gaussian counts of the frame; defaults to
+                    PreprocessWorkload.from_config(config)
+
+    Returns:
+        Cycle count (array if the counts are arrays)
+    """
+    c = config
+    p = preprocess or PreprocessWorkload.from_config(c)
+    fetch_batches = _batches(p.loaded, c.resources_guassian)
+    batches = _batches(p.visible, c.resources_guassian)
+
+    cycles_BP_1 = (
+    max(c.conv2D_3D_cycles, c.conv3D_R_cycles, c.R_q_cycles) *
+    batches +
+    c.conv2D_3D_cycles + c.conv3D_R_cycles + c.R_q_cycles -
+    max(c.conv2D_3D_cycles, c.conv3D_R_cycles, c.R_q_cycles))
+
+    cycles_BP_2 = (
+    max(c.conv2D_T_cycles, c.T_J_cycles, c.J_3D_cycles) *
+    batches +
+    c.conv2D_T_cycles + c.T_J_cycles + c.J_3D_cycles -
+    max(c.conv2D_T_cycles, c.T_J_cycles, c.J_3D_cycles))
+
+    cycles_BP_3 = (
+    max(c.color_SH_cycles, c.SH_position_cycles) *
+    batches +
+    c.color_SH_cycles + c.SH_position_cycles -
+    max(c.color_SH_cycles, c.SH_position_cycles))
+
+    cycles_BP_4 = (
+    c.position2D_3D_cycles *
+    batches)
+
+    cycles = (
+    1 * c.preprocess_setup_cycles + c.preprocess_fetch_cycles * fetch_batches +
+    np.maximum.reduce([cycles_BP_1, cycles_BP_2, cycles_BP_3, cycles_BP_4]))
+    if p.duplicates is not None:
+        cycles = cycles + c.duplicate_cycles * np.ceil(np.asarray(p.duplicates) / c.resources_guassian).astype(np.int64)
+    return _as_count(cycles)
+
+
+def frame_latency(max_pe_time: Count,
+                  width: int,
+                  height: int,
+                  down: int,
+                  config: HardwareConfig = DEFAULT_HARDWARE,
+                  preprocess: Optional[PreprocessWorkload] = None) -> LatencyBreakdown:
+    """
+    Latency of one frame
+
+    Args:
+        max_pe_time: Makespan of the tile schedule in Gaussian steps
+        width: Image width
+        height: Image height
+        down: Downsample stride inside each tile
+        config: Hardware configuration
+        preprocess: Gaussian counts of the frame, see preprocessing_cycles
+
+    Returns:
+        LatencyBreakdown in seconds
+    """
+    c = config
+    rendering_cycles = (
+        c.render_setup_cycles
+        + max_pe_time * (c.render_forward_cycles + c.render_backward_cycles)
+        + c.pixel_pass_cycles * (width * height / (down * down * c.resources_pixels))
+    ) + c.gmu_cycles * c.gmu_dominate
+    return LatencyBreakdown(
+        rendering_s=rendering_cycles * c.cycle_time_s,
+        preprocessing_s=preprocessing_cycles(c, preprocess) * c.cycle_time_s,
+    )
+
+
+@dataclass(frozen=True)
+class AreaBreakdown:
+    """Accelerator area per block in mm^2"""
+    rendering_mm2: float
+    preprocessing_mm2: float
+    adder_tree_mm2: float
+    wsu_mm2: float
+    sram_mm2: float
+
+    @property
+    def total_mm2(self) -> float:
+        return (self.sram_mm2 + self.adder_tree_mm2 + self.rendering_mm2
+                + self.preprocessing_mm2 + self.wsu_mm2)
+
+
+@dataclass(frozen=True)
+class UnitCosts:
+    """
+    Per-unit energies of one hardware configuration in pJ
+
+    Frame energy is linear in the workload: sampled Gaussian-pixel pairs,
+    rendered pixels, visible and loaded Gaussians and duplicated keys.
+    Fields may be (C, 1) arrays to evaluate C configurations at once.
+    """
+    render_pair_pJ: float
+    render_pixel_pJ: float
+    preprocess_visible_pJ: float
+    preprocess_loaded_pJ: float
+    sram_pair_pJ: float
+    sram_pixel_pJ: float
+    sram_loaded_pJ: float
+    sram_key_pJ: float
+
+
+@lru_cache(maxsize=256)
+def area_breakdown(config: HardwareConfig = DEFAULT_HARDWARE) -> AreaBreakdown:
+    """Accelerator area per block, computed once per configuration"""
+    c = config
+    add_sub_area, mul_area = c.add_sub_area, c.mul_area
+    exp_area, div_area, pow_area = c.exp_area, c.div_area, c.pow_area
+    scale = c.area_scaling
+    sram_line = c.sram_area_per_line
+
+    adder_tree=(16+16+8*1.5)*add_sub_area*4/(scale*scale*1000000)
+    WSU_area=80*add_sub_area*16/(scale*scale*1000000)
+    sram_area=(c.adder_tree_buffer_kb+c.global_buffer_kb+c.wsu_buffer_kb)*1024/128*sram_line/1000000
+    rendering_A_area=5*add_sub_area+9*mul_area+1*exp_area
+    rendering_C_area=2*add_sub_area+2*mul_area
+    rendering_get_loss_area=4*add_sub_area+4*pow_area+3*add_sub_area
+    rendering_loss_2Dcolor_area=1*mul_area
+    loss_pixelalpha_area=16*add_sub_area+12*mul_area
+    pixelalpha_distribution_area=4*add_sub_area+7*mul_area
+    distribution_2Dconv_position_area=11*mul_area
+    rendering_area=(rendering_A_area+rendering_C_area+rendering_get_loss_area+rendering_loss_2Dcolor_area+loss_pixelalpha_area
+                    +loss_pixelalpha_area+pixelalpha_distribution_area+distribution_2Dconv_position_area)*c.resources_pixels
+    conv2D_3D_area=15*add_sub_area+45*mul_area
+    conv3D_R_area=9*add_sub_area+9*mul_area
+    R_q_area=20*add_sub_area+22*mul_area
+    conv2D_T_area=18*add_sub_area+33*mul_area
+    T_J_area=12*add_sub_area+8*mul_area
+    J_3D_area=5*add_sub_area+20*mul_area+1*div_area
+    color_SH_area=3*mul_area
+    position2D_3D_area=16*add_sub_area+25*mul_area+1*div_area
+    SH_position_area=20*add_sub_area+22*mul_area
+    position_camera_pose_area=48*add_sub_area+54*mul_area
+    preprocessing_area=(conv2D_3D_area+conv3D_R_area+R_q_area+conv2D_T_area+T_J_area+J_3D_area+color_SH_area+position2D_3D_area+SH_position_area\
++position_camera_pose_area)*c.resources_guassian
+
+    return AreaBreakdown(
+        rendering_mm2=rendering_area/(1000000.0*scale*scale),
+        preprocessing_mm2=preprocessing_area/(1000000.0*scale*scale),
+        adder_tree_mm2=adder_tree,
+        wsu_mm2=WSU_area,
+        sram_mm2=sram_area,
+    )
+
+
+def accelerator_area(config: HardwareConfig = DEFAULT_HARDWARE) -> float:
+    """Total accelerator area in mm^2"""
+    return area_breakdown(config).total_mm2
+
+
+@lru_cache(maxsize=256)
+def unit_costs(config: HardwareConfig = DEFAULT_HARDWARE) -> UnitCosts:
+    """Per-unit energies, computed once per configuration"""
+    c = config
+    add_sub_energy = c.add_sub_energy
+    mul_energy = c.mul_energy
+    exp_energy = c.exp_energy
+    div_energy = c.div_energy
+    read_SRAM_energy = c.read_SRAM_energy
+    write_SRAM_energy = c.write_SRAM_energy
+
+    # Rendering datapath, per Gaussian-pixel pair
+    rendering_A_energy = 5 * add_sub_energy + 9 * mul_energy + exp_energy
+    rendering_C_energy = 2 * add_sub_energy + 2 * mul_energy
+    rendering_loss_2Dcolor_energy = 1 * mul_energy
+    loss_pixelalpha_energy = 16 * add_sub_energy + 12 * mul_energy
+    pixelalpha_distribution_energy = 4 * add_sub_energy + 7 * mul_energy
+    distribution_2Dconv_position_energy = 11 * mul_energy
+    adder_color_conv_position_energy = add_sub_energy
+    # Loss evaluation, per rendered pixel
+    rendering_get_loss_energy = 4 * add_sub_energy + 4 * exp_energy + 3 * add_sub_energy
+
+    # Preprocessing datapath, per visible Gaussian
+    conv2D_3D_energy = 15 * add_sub_energy + 45 * mul_energy
+    conv3D_R_energy = 9 * add_sub_energy + 9 * mul_energy
+    R_q_energy = 20 * add_sub_energy + 22 * mul_energy
+    conv2D_T_energy = 18 * add_sub_energy + 33 * mul_energy
+    T_J_energy = 12 * add_sub_energy + 8 * mul_energy
+    J_3D_energy = 5 * add_sub_energy + 20 * mul_energy + div_energy
+    color_SH_energy = 3 * mul_energy
+    position2D_3D_energy = 16 * add_sub_energy + 25 * mul_energy + div_energy
+    SH_position_energy = 20 * add_sub_energy + 22 * mul_energy
+    position_adder_energy = 9 * (15 * add_sub_energy) / c.resources_guassian
+    # Camera-pose transform, per loaded Gaussian
+    position_camera_pose_energy = 48 * add_sub_energy + 54 * mul_energy
+
+    # SRAM buffers
+    GSC = 10 * read_SRAM_energy * 2 + 10 * write_SRAM_energy * 2 * 8
+    buffer_2D = 10 * read_SRAM_energy * 2 + 10 * write_SRAM_energy * 2 * 8
+    Reuse_buffer = 1 * read_SRAM_energy + 1 * write_SRAM_energy * 8
+    Stage_buffer = (8 * read_SRAM_energy + 8 * write_SRAM_energy) * 3 * 8
+    pixel = 2 * (read_SRAM_energy + write_SRAM_energy)
+    buffer_3D = 14 * read_SRAM_energy + 14 * write_SRAM_energy * 8
+    # Every tile-Gaussian key is written once by duplication and read once by the sort
+    Key_buffer = read_SRAM_energy + write_SRAM_energy
+
+    return UnitCosts(
+        render_pair_pJ=(rendering_A_energy + rendering_C_energy + rendering_loss_2Dcolor_energy + loss_pixelalpha_energy
+                        + pixelalpha_distribution_energy + distribution_2Dconv_position_energy
+                        + adder_color_conv_position_energy),
+        render_pixel_pJ=rendering_get_loss_energy,
+        preprocess_visible_pJ=(conv2D_3D_energy + conv3D_R_energy + R_q_energy + conv2D_T_energy + T_J_energy
+                               + J_3D_energy + color_SH_energy + position2D_3D_energy + SH_position_energy
+                               + position_adder_energy),
+        preprocess_loaded_pJ=position_camera_pose_energy,
+        sram_pair_pJ=GSC + buffer_2D + Reuse_buffer + Stage_buffer,
+        sram_pixel_pJ=pixel,
+        sram_loaded_pJ=buffer_3D,
+        sram_key_pJ=Key_buffer,
+    )
+
+
+def stacked_unit_costs(configs: Sequence[HardwareConfig]) -> UnitCosts:
+    """UnitCosts of many configurations as (C, 1) columns, for broadcasting against workloads"""
+    costs = [unit_costs(config) for config in configs]
+    return UnitCosts(**{
+        field.name: np.array([getattr(cost, field.name) for cost in costs])[:, None]
+        for field in fields(UnitCosts)
+    })
+
+
+def workload_energy(units: UnitCosts,
+                    sum_all_gaussian: Count,
+                    pixels: Count,
+                    preprocess: PreprocessWorkload) -> EnergyBreakdown:
+    """
+    Energy of workloads under precomputed unit costs
+
+    Args:
+        units: unit_costs of one configuration, or stacked_unit_costs of many
+        sum_all_gaussian: Gaussian-pixel pairs sampled over all tiles
+        pixels: Rendered (downsampled) pixels
+        preprocess: Gaussian counts, see PreprocessWorkload
+
+    Returns:
+        EnergyBreakdown in pJ; arrays broadcast to (configs, workloads)
+        when stacked costs and arrays of workloads are given
+    """
+    u = units
+    p = preprocess
+    keys = 0 if p.duplicates is None else u.sram_key_pJ * p.duplicates
+    return EnergyBreakdown(
+        rendering_pJ=u.render_pair_pJ * sum_all_gaussian + u.render_pixel_pJ * pixels,
+        preprocessing_pJ=u.preprocess_visible_pJ * p.visible + u.preprocess_loaded_pJ * p.loaded,
+        sram_pJ=(u.sram_pair_pJ * sum_all_gaussian + u.sram_pixel_pJ * pixels
+                 + u.sram_loaded_pJ * p.loaded + keys),
+    )
+
+
+def frame_energy(sum_all_gaussian: Count,
+                 width: int,
+                 height: int,
+                 down: int,
+                 config: HardwareConfig = DEFAULT_HARDWARE,
+                 preprocess: Optional[PreprocessWorkload] = None) -> EnergyBreakdown:
+    """
+    Energy of one frame
+
+    Args:
+        sum_all_gaussian: Gaussian-pixel pairs sampled over all tiles
+        width: Image width
+        height: Image height
+        down: Downsample stride inside each tile
+        config: Hardware configuration
+        preprocess: Gaussian counts of the frame, see preprocessing_cycles;
+                    the camera-pose transform and the 3D buffer see every
+                    loaded Gaussian, the rest of preprocessing only the
+                    visible ones
+
+    Returns:
+        EnergyBreakdown in pJ
+    """
+    p = preprocess or PreprocessWorkload.from_config(config)
+    return workload_energy(unit_costs(config), sum_all_gaussian, width * height / (down * down), p)
+
+
+def energy_table(configs: Sequence[HardwareConfig],
+                 sum_all_gaussian: Count,
+                 width: Count,
+                 height: Count,
+                 down: Count,
+                 preprocess: Optional[PreprocessWorkload] = None) -> EnergyBreakdown:
+    """
+    Energy of F frames under C configurations in one vectorized pass
+
+    Args:
+        configs: Hardware configurations
+        sum_all_gaussian: (F,) Gaussian-pixel pairs per frame
+        width: Image width, scalar or (F,)
+        height: Image height, scalar or (F,)
+        down: Downsample stride, scalar or (F,)
+        preprocess: Gaussian counts with (F,) fields; defaults to each
+                    configuration's gaussian_all
+
+    Returns:
+        EnergyBreakdown with (C, F) arrays in pJ
+    """
+    sum_all_gaussian = np.atleast_1d(np.asarray(sum_all_gaussian, dtype=np.float64))
+    pixels = np.asarray(width) * np.asarray(height) / (np.asarray(down) * np.asarray(down))
+    if preprocess is None:
+        fallback = np.array([config.gaussian_all for config in configs])[:, None]
+        preprocess = PreprocessWorkload(fallback, fallback)
+    return workload_energy(stacked_unit_costs(configs), sum_all_gaussian, pixels, preprocess)
+
+
+# Scalar entry points kept for existing callers; the default hardware is used
+# with the preprocessing lane count overridden
+def simulation(max_pe_time, width, height, down, resources_guassian=DEFAULT_HARDWARE.resources_guassian):
+    config = DEFAULT_HARDWARE.with_overrides(resources_guassian=resources_guassian)
+    return frame_latency(max_pe_time, width, height, down, config).total_s
+
+def area(resources_guassian=DEFAULT_HARDWARE.resources_guassian):
+    return accelerator_area(DEFAULT_HARDWARE.with_overrides(resources_guassian=resources_guassian))
+
+def energy(sum_all_gaussian, width, height, down, resources_guassian=DEFAULT_HARDWARE.resources_guassian):
+    config = DEFAULT_HARDWARE.with_overrides(resources_guassian=resources_guassian)
+    return frame_energy(sum_all_gaussian, width, height, down, config).total_pJ
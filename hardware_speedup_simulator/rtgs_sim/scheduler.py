@@ -0,0 +1,127 @@
+"""
+Tile-to-PE schedulers for the RTGS rendering engine
+Each policy maps per-tile execution cycles onto the rendering PEs
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+import numpy as np
+
+
+@dataclass
+class ScheduleResult:
+    """Outcome of assigning tiles to PEs"""
+    policy: str
+    assignment: np.ndarray  # PE index per tile, in row-major tile order
+    pe_loads: np.ndarray    # Total cycles per PE
+
+    @property
+    def makespan(self) -> int:
+        return int(self.pe_loads.max()) if self.pe_loads.size else 0
+
+    @property
+    def utilization(self) -> np.ndarray:
+        """Per-PE busy fraction of the makespan"""
+        if self.makespan == 0:
+            return np.zeros(self.pe_loads.shape, dtype=np.float64)
+        return self.pe_loads / self.makespan
+
+    @property
+    def mean_utilization(self) -> float:
+        return float(self.utilization.mean()) if self.pe_loads.size else 0.0
+
+
+def _heap_assign(exec_times: np.ndarray, order: np.ndarray, num_pes: int) -> np.ndarray:
+    """Assign tiles in the given order to the least loaded PE (lowest index on ties)"""
+    assignment = np.empty(exec_times.shape[0], dtype=np.int64)
+    heap = [(0, pe) for pe in range(num_pes)]
+    for tile, exec_time in zip(order.tolist(), exec_times[order].tolist()):
+        load, pe = heapq.heappop(heap)
+        assignment[tile] = pe
+        heapq.heappush(heap, (load + exec_time, pe))
+    return assignment
+
+
+def greedy_schedule(tile_times: np.ndarray, num_pes: int) -> np.ndarray:
+    """Tiles in raster order, each to the currently least loaded PE"""
+    exec_times = tile_times.ravel()
+    return _heap_assign(exec_times, np.arange(exec_times.shape[0]), num_pes)
+
+
+def lpt_schedule(tile_times: np.ndarray, num_pes: int) -> np.ndarray:
+    """Longest-processing-time-first: heaviest tiles are placed first"""
+    exec_times = tile_times.ravel()
+    order = np.argsort(-exec_times, kind="stable")
+    return _heap_assign(exec_times, order, num_pes)
+
+
+def round_robin_schedule(tile_times: np.ndarray, num_pes: int) -> np.ndarray:
+    """Tile i goes to PE i % num_pes regardless of load"""
+    return np.arange(tile_times.size, dtype=np.int64) % num_pes
+
+
+def morton_codes(tiles_y: int, tiles_x: int) -> np.ndarray:
+    """Z-order code of every tile of a (tiles_y, tiles_x) grid, row-major"""
+    ty, tx = np.meshgrid(np.arange(tiles_y), np.arange(tiles_x), indexing="ij")
+    codes = np.zeros(ty.shape, dtype=np.int64)
+    bits = max(int(tiles_y - 1).bit_length(), int(tiles_x - 1).bit_length(), 1)
+    for b in range(bits):
+        codes |= ((tx >> b) & 1) << (2 * b)
+        codes |= ((ty >> b) & 1) << (2 * b + 1)
+    return codes.ravel()
+
+
+def morton_schedule(tile_times: np.ndarray, num_pes: int) -> np.ndarray:
+    """
+    Locality-preserving schedule: tiles are walked in Morton order and the
+    sequence is cut into num_pes contiguous chunks of roughly equal load,
+    so each PE works on a spatially coherent region
+    """
+    if tile_times.ndim != 2:
+        raise ValueError("Morton scheduling needs tile times shaped (tiles_y, tiles_x)")
+    exec_times = tile_times.ravel()
+    order = np.argsort(morton_codes(*tile_times.shape), kind="stable")
+    cumulative = np.cumsum(exec_times[order])
+    total = cumulative[-1] if cumulative.size else 0
+    if total == 0:
+        chunk = np.arange(order.shape[0]) * num_pes // max(order.shape[0], 1)
+    else:
+        # Tile belongs to the chunk its load midpoint falls into
+        midpoints = cumulative - exec_times[order] / 2
+        chunk = np.minimum((midpoints * num_pes / total).astype(np.int64), num_pes - 1)
+    assignment = np.empty(exec_times.shape[0], dtype=np.int64)
+    assignment[order] = chunk
+    return assignment
+
+
+SCHEDULERS: Dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    "greedy": greedy_schedule,
+    "lpt": lpt_schedule,
+    "round_robin": round_robin_schedule,
+    "morton": morton_schedule,
+}
+
+
+def schedule(tile_times: np.ndarray, num_pes: int, policy: str = "greedy") -> ScheduleResult:
+    """
+    Assign tiles to PEs with the selected policy
+
+    Args:
+        tile_times: Per-tile execution cycles shaped (tiles_y, tiles_x)
+        num_pes: Number of rendering PEs
+        policy: One of SCHEDULERS
+
+    Returns:
+        ScheduleResult with the per-tile assignment and per-PE loads
+    """
+    if policy not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduling policy '{policy}', choose from {sorted(SCHEDULERS)}")
+    if num_pes < 1:
+        raise ValueError("num_pes must be positive")
+
+    tile_times = np.asarray(tile_times, dtype=np.int64)
+    assignment = SCHEDULERS[policy](tile_times, num_pes)
+    pe_loads = np.bincount(assignment, weights=tile_times.ravel(), minlength=num_pes)
+    return ScheduleResult(policy, assignment, pe_loads.astype(np.int64))
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Multi-frame simulation for the RTGS simulator
+Streams a workload sequence frame by frame through the latency/energy model
+
+Usage:
+    python -m rtgs_sim.sequence workloads.npz --output frame_report.csv
+"""
+
+import argparse
+import csv
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rtgs_sim.cache import StageCache, cached_tile_stats, workload_hash
+from rtgs_sim.model import PreprocessWorkload
+from rtgs_sim.scheduler import SCHEDULERS
+from rtgs_sim.simulator import FrameResult, frame_count_map, frame_tile_stats
+from rtgs_sim.sweep import DEFAULT_POINT, evaluate_tile_stats, split_point
+from rtgs_sim.tile_workload import TileStats
+from rtgs_sim.workload_io import PixelWorkload, iter_workload_sequence
+
+FRAME_COLUMNS = [
+    "frame_id",
+    "num_pixels",
+    "sum_all_gaussian",
+    "max_pe_time",
+    "pe_utilization",
+    "num_visible",
+    "preprocessing_s",
+    "latency_s",
+    "energy_pJ",
+    "cumulative_energy_pJ",
+]
+
+PERCENTILES = (50, 95, 99)
+
+# Per-frame quantities stored in the cached frame manifest (-1 for unknown)
+MANIFEST_COLUMNS = ("frame_id", "width", "height", "num_pixels",
+                    "num_gaussians", "num_visible", "total_gaussians")
+
+
+def _frame_info(frame_id: int, workload: PixelWorkload, num_pixels: int) -> Dict:
+    """Per-frame quantities the model needs besides the tile statistics"""
+    return {
+        "frame_id": frame_id,
+        "width": workload.width,
+        "height": workload.height,
+        "num_pixels": num_pixels,
+        "num_gaussians": workload.num_gaussians,
+        "num_visible": workload.num_visible,
+        "total_gaussians": workload.total_gaussians,
+    }
+
+
+def _frame_point(point: Dict, info: Dict) -> Dict:
+    frame_point = dict(point)
+    if info["width"] is not None and info["height"] is not None:
+        frame_point["width"], frame_point["height"] = info["width"], info["height"]
+    return frame_point
+
+
+def _frame_preprocess(info: Dict) -> Optional[PreprocessWorkload]:
+    """Same as preprocess_workload, from a frame info dictionary"""
+    if info["num_gaussians"] is None:
+        return None
+    return PreprocessWorkload(info["num_gaussians"], info["num_visible"], info["total_gaussians"])
+
+
+def iter_tile_stats(path: str,
+                    point: Dict,
+                    cache: Optional[StageCache] = None) -> Iterator[Tuple[Dict, Dict, TileStats]]:
+    """
+    Tile statistics of every frame of a sequence
+
+    With a cache, a manifest of the frames (ids, sizes, Gaussian counts) is
+    stored next to the per-frame count maps and tile statistics. Once it
+    exists, frames are only read from the workload when their count map at
+    the requested frame size and tiling is missing.
+
+    Args:
+        path: Directory of per-frame files, chunked .npz or single workload file
+        point: Complete parameter dictionary, see DEFAULT_POINT
+        cache: Optional on-disk stage cache
+
+    Yields:
+        (info, frame_point, tile_stats) per frame, where info holds the
+        frame_id, image size, pixel count and Gaussian counts and
+        frame_point is point with the frame's own image size
+    """
+    frames = iter_workload_sequence(path, with_indices=False)
+    source = workload_hash(path) if cache else None
+    manifest = cache.get("frames", {"source": source}) if cache else None
+
+    if manifest is None:
+        infos = []
+        for frame_id, workload in frames:
+            coords, counts = workload.pixel_counts()
+            info = _frame_info(frame_id, workload, len(counts))
+            infos.append(info)
+            frame_point = _frame_point(point, info)
+            render = split_point(frame_point)[0]
+            if cache:
+                tile_stats = cached_tile_stats(cache, source, frame_id, render, lambda: (coords, counts))
+            else:
+                tile_stats = frame_tile_stats(frame_count_map(coords, counts, render), render)
+            yield info, frame_point, tile_stats
+        if cache:
+            cache.put("frames", {"source": source}, {
+                name: np.array([-1 if info[name] is None else info[name] for info in infos], dtype=np.int64)
+                for name in MANIFEST_COLUMNS
+            })
+        return
+
+    def load_counts(frame_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Frames are requested in order, so the lazy reader only moves forward
+        for loaded_id, workload in frames:
+            if loaded_id == frame_id:
+                return workload.pixel_counts()
+        raise ValueError(f"Frame {frame_id} missing from {path}; clear the cache")
+
+    for values in zip(*(manifest[name] for name in MANIFEST_COLUMNS)):
+        info = {name: None if value < 0 else int(value) for name, value in zip(MANIFEST_COLUMNS, values)}
+        frame_point = _frame_point(point, info)
+        render = split_point(frame_point)[0]
+        frame_id = info["frame_id"]
+        tile_stats = cached_tile_stats(cache, source, frame_id, render, lambda: load_counts(frame_id))
+        yield info, frame_point, tile_stats
+
+
+def simulate_sequence(path: str,
+                      point: Optional[Dict] = None,
+                      cache: Optional[StageCache] = None) -> Iterator[Tuple[Dict, FrameResult]]:
+    """
+    Simulate every frame of a workload sequence
+
+    Frames are loaded lazily (one at a time, without Gaussian indices), so
+    memory stays bounded by the largest single frame.
+
+    Args:
+        path: Directory of per-frame files, chunked .npz or single workload file
+        point: Parameter dictionary, see DEFAULT_POINT; frames that record
+               their own image size override width/height
+        cache: Optional on-disk stage cache, see iter_tile_stats; only the
+               scheduling and latency/energy stages then run for frames
+               whose tiling was simulated before
+
+    Yields:
+        (row, frame_result) per frame, where row holds the FRAME_COLUMNS
+    """
+    point = dict(DEFAULT_POINT, **(point or {}))
+    cumulative_energy = 0.0
+    for info, frame_point, tile_stats in iter_tile_stats(path, point, cache):
+        result, frame_result = evaluate_tile_stats(tile_stats, frame_point, _frame_preprocess(info))
+        cumulative_energy += result["energy_pJ"]
+
+        row = {name: result[name] for name in FRAME_COLUMNS if name in result}
+        row["frame_id"] = info["frame_id"]
+        row["num_pixels"] = info["num_pixels"]
+        row["num_visible"] = info["num_visible"]
+        row["preprocessing_s"] = frame_result.latency.preprocessing_s
+        row["cumulative_energy_pJ"] = cumulative_energy
+        yield row, frame_result
+
+
+def summarize_latencies(latencies: Sequence[float],
+                        percentiles: Sequence[int] = PERCENTILES) -> Dict[str, float]:
+    """
+    Summary statistics of per-frame latencies
+
+    Args:
+        latencies: Per-frame latency in seconds
+        percentiles: Percentiles of the frame time to report
+
+    Returns:
+        Dictionary with frames, total_s, mean_s, max_s and p<q>_s entries
+    """
+    latencies = np.asarray(latencies, dtype=np.float64)
+    if latencies.size == 0:
+        return {"frames": 0}
+    summary = {
+        "frames": int(latencies.size),
+        "total_s": float(latencies.sum()),
+        "mean_s": float(latencies.mean()),
+        "max_s": float(latencies.max()),
+    }
+    for q, value in zip(percentiles, np.percentile(latencies, percentiles)):
+        summary[f"p{q}_s"] = float(value)
+    return summary
+
+
+def run_sequence(path: str,
+                 point: Optional[Dict] = None,
+                 output_file: Optional[str] = None,
+                 cache: Optional[StageCache] = None
+                 ) -> Tuple[Dict[str, float], np.ndarray, Optional[FrameResult]]:
+    """
+    Simulate a sequence, streaming per-frame rows to a CSV report
+
+    Args:
+        path: Workload sequence, see simulate_sequence
+        point: Parameter dictionary, see DEFAULT_POINT
+        output_file: Optional per-frame CSV report
+        cache: Optional on-disk stage cache, see simulate_sequence
+
+    Returns:
+        Latency summary (see summarize_latencies, plus total_energy_pJ and
+        worst_frame_id), the per-PE loads accumulated over all frames and
+        the FrameResult of the slowest frame (None for an empty sequence)
+    """
+    latencies: List[float] = []
+    pe_loads = None
+    worst, worst_id = None, None
+    total_energy = 0.0
+    f = open(output_file, "w", newline="") if output_file else None
+    try:
+        writer = csv.DictWriter(f, fieldnames=FRAME_COLUMNS) if f else None
+        if writer:
+            writer.writeheader()
+        for row, frame_result in simulate_sequence(path, point, cache):
+            latencies.append(row["latency_s"])
+            total_energy = row["cumulative_energy_pJ"]
+            if pe_loads is None:
+                pe_loads = frame_result.schedule.pe_loads.copy()
+            else:
+                pe_loads += frame_result.schedule.pe_loads
+            if worst is None or frame_result.latency_s > worst.latency_s:
+                worst, worst_id = frame_result, row["frame_id"]
+            if writer:
+                writer.writerow(row)
+    finally:
+        if f:
+            f.close()
+
+    summary = summarize_latencies(latencies)
+    summary["total_energy_pJ"] = total_energy
+    summary["worst_frame_id"] = worst_id
+    if pe_loads is None:
+        pe_loads = np.zeros(0, dtype=np.int64)
+    return summary, pe_loads, worst
+
+
+def print_summary(summary: Dict[str, float]):
+    """Print a latency summary produced by run_sequence"""
+    if summary["frames"] == 0:
+        print("⚠️ No frames simulated")
+        return
+    print(f"🎞️ Frames: {summary['frames']}")
+    print(f"⏱️ Total latency: {summary['total_s']:.6g} s, mean frame time: {summary['mean_s']:.6g} s")
+    print("📊 Frame time " + ", ".join(
+        f"p{q}: {summary[f'p{q}_s']:.6g} s" for q in PERCENTILES
+    ) + f", max: {summary['max_s']:.6g} s")
+    print(f"⚡ Cumulative energy: {summary['total_energy_pJ']:.6g} pJ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate a multi-frame RTGS workload sequence')
+    parser.add_argument('input', help='Sequence directory, chunked .npz or single workload file')
+    parser.add_argument('--output', default='frame_report.csv', help='Per-frame CSV report')
+    parser.add_argument('--cache-dir', help='Reuse count maps and tile statistics cached in this directory')
+    for name, default in DEFAULT_POINT.items():
+        if name == "policy":
+            continue
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default,
+                            help=f'(default: {default})')
+    parser.add_argument('--policy', choices=sorted(SCHEDULERS), default=DEFAULT_POINT["policy"],
+                        help='PE scheduling policy')
+
+    args = parser.parse_args()
+    point = {name: getattr(args, name) for name in DEFAULT_POINT}
+
+    print(f"🔄 Simulating sequence {args.input}...")
+    cache = StageCache(args.cache_dir) if args.cache_dir else None
+    summary, _, _ = run_sequence(args.input, point, args.output, cache)
+    print_summary(summary)
+    if cache:
+        print(f"🗃️ Cache {cache.summary()}")
+    print(f"✅ Saved per-frame report to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Single-frame RTGS simulation: workload -> tiles -> PE schedule -> latency/energy
+Pure functions without file I/O, for notebooks and sweep drivers
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from rtgs_sim.config import DEFAULT_HARDWARE, HardwareConfig
+from rtgs_sim.model import (
+    EnergyBreakdown,
+    LatencyBreakdown,
+    PreprocessWorkload,
+    frame_energy,
+    frame_latency,
+)
+from rtgs_sim.scheduler import ScheduleResult, schedule
+from rtgs_sim.tile_workload import TileStats, compute_tile_stats, count_map_from_coords
+from rtgs_sim.workload_io import PixelWorkload
+
+
+@dataclass(frozen=True)
+class RenderConfig:
+    """Frame geometry, tiling and scheduling parameters of one simulation"""
+    width: int = 1752
+    height: int = 1160
+    tile_size_1: int = 16
+    tile_size_2: int = 16
+    downsample_stride: int = 4
+    group: int = 2
+    policy: str = "greedy"
+
+
+DEFAULT_RENDER = RenderConfig()
+
+
+@dataclass(frozen=True)
+class FrameResult:
+    """Everything the model derives for one frame"""
+    tile_stats: TileStats
+    schedule: ScheduleResult
+    latency: LatencyBreakdown
+    energy: EnergyBreakdown
+
+    @property
+    def latency_s(self) -> float:
+        return self.latency.total_s
+
+    @property
+    def energy_pJ(self) -> float:
+        return self.energy.total_pJ
+
+
+def preprocess_workload(workload: PixelWorkload) -> Optional[PreprocessWorkload]:
+    """
+    Preprocessing counts recorded on a workload
+
+    Returns:
+        PreprocessWorkload with the loaded and visible Gaussians and the
+        tile-Gaussian duplicates, or None for workloads that predate the
+        counts (the model then falls back to HardwareConfig.gaussian_all)
+    """
+    if workload.num_gaussians is None:
+        return None
+    return PreprocessWorkload(
+        loaded=workload.num_gaussians,
+        visible=workload.num_visible,
+        duplicates=workload.total_gaussians,
+    )
+
+
+def frame_count_map(coords: np.ndarray,
+                    counts: np.ndarray,
+                    render: RenderConfig = DEFAULT_RENDER) -> np.ndarray:
+    """Per-pixel Gaussian count map of one frame, padded to whole tiles"""
+    # Pixels projected outside a smaller frame are not rendered
+    inside = (coords[:, 0] < render.width) & (coords[:, 1] < render.height)
+    return count_map_from_coords(
+        coords[inside], counts[inside], render.width, render.height,
+        render.tile_size_1, render.tile_size_2,
+    )
+
+
+def frame_tile_stats(count_map: np.ndarray, render: RenderConfig = DEFAULT_RENDER) -> TileStats:
+    """Per-tile workload statistics of a count map"""
+    return compute_tile_stats(
+        count_map,
+        render.tile_size_1,
+        render.tile_size_2,
+        render.downsample_stride,
+        render.group,
+    )
+
+
+def simulate_tile_stats(tile_stats: TileStats,
+                        render: RenderConfig = DEFAULT_RENDER,
+                        hardware: HardwareConfig = DEFAULT_HARDWARE,
+                        preprocess: Optional[PreprocessWorkload] = None) -> FrameResult:
+    """
+    Schedule precomputed tile statistics and apply the latency/energy model
+
+    Only this stage depends on the PE-side parameters (num_pes, policy and
+    the HardwareConfig costs), so sweeps over them can reuse tile_stats.
+    """
+    schedule_result = schedule(tile_stats.group_max, hardware.num_pes, render.policy)
+    width, height, down = render.width, render.height, render.downsample_stride
+    return FrameResult(
+        tile_stats=tile_stats,
+        schedule=schedule_result,
+        latency=frame_latency(schedule_result.makespan, width, height, down, hardware, preprocess),
+        energy=frame_energy(tile_stats.sum_all_gaussian, width, height, down, hardware, preprocess),
+    )
+
+
+def simulate_counts(coords: np.ndarray,
+                    counts: np.ndarray,
+                    render: RenderConfig = DEFAULT_RENDER,
+                    hardware: HardwareConfig = DEFAULT_HARDWARE,
+                    preprocess: Optional[PreprocessWorkload] = None) -> FrameResult:
+    """
+    Simulate one frame from per-pixel Gaussian counts
+
+    Args:
+        coords: (N, 2) array of (u, v) pixel coordinates
+        counts: (N,) array of Gaussian counts per pixel
+        render: Frame geometry, tiling and scheduling parameters
+        hardware: Accelerator configuration
+        preprocess: Gaussian counts for the preprocessing model, see
+                    preprocess_workload
+
+    Returns:
+        FrameResult with the tile statistics, PE schedule, latency and energy
+    """
+    tile_stats = frame_tile_stats(frame_count_map(coords, counts, render), render)
+    return simulate_tile_stats(tile_stats, render, hardware, preprocess)
+
+
+def simulate_workload(workload: PixelWorkload,
+                      render: RenderConfig = DEFAULT_RENDER,
+                      hardware: HardwareConfig = DEFAULT_HARDWARE) -> FrameResult:
+    """Simulate one frame of a PixelWorkload, see simulate_counts"""
+    coords, counts = workload.pixel_counts()
+    return simulate_counts(coords, counts, render, hardware, preprocess_workload(workload))
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Design-space sweep for the RTGS simulator
+Evaluates a grid of hardware/tiling parameters in parallel over one workload
+
+Usage:
+    python -m rtgs_sim.sweep transformed_data.npz --num-pes 8 16 32 --group 2 4
+"""
+
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rtgs_sim.cache import (
+    COUNT_MAP_PARAMETERS,
+    TILE_STATS_PARAMETERS,
+    StageCache,
+    cached_tile_stats,
+    workload_hash,
+)
+from rtgs_sim.config import DEFAULT_HARDWARE, HardwareConfig
+from rtgs_sim.model import AreaBreakdown, EnergyBreakdown, PreprocessWorkload, area_breakdown
+from rtgs_sim.scheduler import SCHEDULERS
+from rtgs_sim.simulator import (
+    FrameResult,
+    RenderConfig,
+    frame_count_map,
+    frame_tile_stats,
+    preprocess_workload,
+    simulate_tile_stats,
+)
+from rtgs_sim.tile_workload import TileStats
+from rtgs_sim.workload_io import load_workload
+
+DEFAULT_POINT = {
+    "width": 1752,
+    "height": 1160,
+    "tile_size_1": 16,
+    "tile_size_2": 16,
+    "downsample_stride": 4,
+    "group": 2,
+    "num_pes": 16,
+    "resources_guassian": 16,
+    "policy": "greedy",
+}
+
+# Which HardwareConfig fields the design point overrides; the rest are RenderConfig
+HARDWARE_PARAMETERS = ("num_pes", "resources_guassian")
+RENDER_PARAMETERS = tuple(name for name in DEFAULT_POINT if name not in HARDWARE_PARAMETERS)
+
+RESULT_COLUMNS = list(DEFAULT_POINT) + [
+    "sum_all_gaussian",
+    "max_pe_time",
+    "pe_utilization",
+    "latency_s",
+    "energy_pJ",
+    "area_mm2",
+]
+# Per-block energy and area, to see which block dominates at each design point
+RESULT_COLUMNS += [f.name for f in fields(EnergyBreakdown)] + [f.name for f in fields(AreaBreakdown)]
+
+def expand_grid(grid: Dict[str, Sequence]) -> List[Dict]:
+    """
+    Expand a parameter grid into the list of design points
+
+    Args:
+        grid: Mapping of parameter name to the values to sweep; parameters
+              that are missing keep their DEFAULT_POINT value
+
+    Returns:
+        List of complete parameter dictionaries (cartesian product)
+    """
+    unknown = set(grid) - set(DEFAULT_POINT)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+
+    names = list(DEFAULT_POINT)
+    values = [list(grid.get(name, [DEFAULT_POINT[name]])) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def split_point(point: Dict) -> Tuple[RenderConfig, HardwareConfig]:
+    """Split a design-point dictionary into render and hardware configs"""
+    render = RenderConfig(**{name: point[name] for name in RENDER_PARAMETERS})
+    hardware = DEFAULT_HARDWARE.with_overrides(
+        **{name: point[name] for name in HARDWARE_PARAMETERS}
+    )
+    return render, hardware
+
+
+def evaluate_tile_stats(tile_stats: TileStats,
+                        point: Dict,
+                        preprocess: Optional[PreprocessWorkload] = None) -> Tuple[Dict, FrameResult]:
+    """
+    Run the scheduling and latency/energy/area stages on precomputed tile statistics
+
+    Args:
+        tile_stats: Tile statistics of the frame at the point's tiling parameters
+        point: Parameter dictionary, see DEFAULT_POINT
+        preprocess: Gaussian counts for the preprocessing model
+
+    Returns:
+        Row dictionary with the parameters and the model outputs, and the
+        full FrameResult the row was derived from
+    """
+    render, hardware = split_point(point)
+    result = simulate_tile_stats(tile_stats, render, hardware, preprocess)
+
+    row = dict(point)
+    row["sum_all_gaussian"] = result.tile_stats.sum_all_gaussian
+    row["max_pe_time"] = result.schedule.makespan
+    row["pe_utilization"] = result.schedule.mean_utilization
+    row["latency_s"] = result.latency_s
+    row["energy_pJ"] = result.energy_pJ
+    area = area_breakdown(hardware)
+    row["area_mm2"] = area.total_mm2
+    row.update(asdict(result.energy))
+    row.update(asdict(area))
+    return row, result
+
+
+def evaluate_frame(coords: np.ndarray,
+                   counts: np.ndarray,
+                   point: Dict,
+                   preprocess: Optional[PreprocessWorkload] = None) -> Tuple[Dict, FrameResult]:
+    """
+    Run the latency/energy/area model for one frame at one design point
+
+    Args:
+        coords: (N, 2) array of (u, v) pixel coordinates
+        counts: (N,) array of Gaussian counts per pixel
+        point: Parameter dictionary, see DEFAULT_POINT
+        preprocess: Gaussian counts for the preprocessing model
+
+    Returns:
+        Row dictionary with the parameters and the model outputs, and the
+        full FrameResult the row was derived from
+    """
+    render = split_point(point)[0]
+    tile_stats = frame_tile_stats(frame_count_map(coords, counts, render), render)
+    return evaluate_tile_stats(tile_stats, point, preprocess)
+
+
+def evaluate_design_point(coords: np.ndarray,
+                          counts: np.ndarray,
+                          point: Dict,
+                          preprocess: Optional[PreprocessWorkload] = None) -> Dict:
+    """
+    Run the latency/energy/area model for one design point
+
+    Args:
+        coords: (N, 2) array of (u, v) pixel coordinates
+        counts: (N,) array of Gaussian counts per pixel
+        point: Parameter dictionary, see DEFAULT_POINT
+        preprocess: Gaussian counts for the preprocessing model
+
+    Returns:
+        Row dictionary with the parameters and the model outputs
+    """
+    return evaluate_frame(coords, counts, point, preprocess)[0]
+
+
+def sweep_tile_stats(coords: np.ndarray,
+                     counts: np.ndarray,
+                     points: Sequence[Dict],
+                     cache: Optional[StageCache] = None,
+                     source: Optional[str] = None,
+                     frame_id: int = 0) -> Dict[tuple, TileStats]:
+    """
+    Tile statistics of one frame for every distinct tiling among design points
+
+    Points that differ only in PE-side parameters share one entry, and
+    tilings that differ only in downsample stride or group share one count map.
+
+    Args:
+        coords: (N, 2) array of (u, v) pixel coordinates
+        counts: (N,) array of Gaussian counts per pixel
+        points: Parameter dictionaries, see DEFAULT_POINT
+        cache: Optional on-disk stage cache
+        source: workload_hash of the workload, required with a cache
+        frame_id: Frame of the workload the arrays belong to
+
+    Returns:
+        Mapping of the TILE_STATS_PARAMETERS values of a point to its TileStats
+    """
+    count_maps: Dict[tuple, np.ndarray] = {}
+    tile_stats: Dict[tuple, TileStats] = {}
+    for point in points:
+        key = tuple(point[name] for name in TILE_STATS_PARAMETERS)
+        if key in tile_stats:
+            continue
+        render = split_point(point)[0]
+        if cache:
+            tile_stats[key] = cached_tile_stats(cache, source, frame_id, render, lambda: (coords, counts))
+            continue
+        map_key = tuple(point[name] for name in COUNT_MAP_PARAMETERS)
+        if map_key not in count_maps:
+            count_maps[map_key] = frame_count_map(coords, counts, render)
+        tile_stats[key] = frame_tile_stats(count_maps[map_key], render)
+    return tile_stats
+
+
+def _evaluate_task(task) -> Dict:
+    return evaluate_tile_stats(*task)[0]
+
+
+def run_sweep(coords: np.ndarray,
+              counts: np.ndarray,
+              grid: Dict[str, Sequence],
+              max_workers: Optional[int] = None,
+              preprocess: Optional[PreprocessWorkload] = None,
+              cache: Optional[StageCache] = None,
+              source: Optional[str] = None) -> List[Dict]:
+    """
+    Evaluate every point of a parameter grid across a process pool
+
+    Tile statistics are built once per distinct tiling in this process, or
+    read from the cache; only they and the parameter dictionaries travel to
+    the workers, which run the scheduling and latency/energy/area stages.
+
+    Args:
+        coords: (N, 2) array of (u, v) pixel coordinates
+        counts: (N,) array of Gaussian counts per pixel
+        grid: Mapping of parameter name to the values to sweep
+        max_workers: Pool size, defaults to the CPU count; 1 runs in-process
+        preprocess: Gaussian counts for the preprocessing model
+        cache: Optional on-disk stage cache for count maps and tile statistics
+        source: workload_hash of the workload, required with a cache
+
+    Returns:
+        One result row per design point, in grid order
+    """
+    points = expand_grid(grid)
+    tile_stats = sweep_tile_stats(coords, counts, points, cache, source)
+    tasks = [
+        (tile_stats[tuple(point[name] for name in TILE_STATS_PARAMETERS)], point, preprocess)
+        for point in points
+    ]
+    if max_workers == 1 or len(tasks) == 1:
+        return [_evaluate_task(task) for task in tasks]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_evaluate_task, tasks, chunksize=chunksize))
+
+
+def write_table(rows: List[Dict], output_file: str):
+    """Write sweep results as a CSV table"""
+    with open(output_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_table(rows: List[Dict]):
+    """Print sweep results as an aligned text table"""
+    widths = [max(len(name), 12) for name in RESULT_COLUMNS]
+    print(" ".join(f"{name:>{w}}" for name, w in zip(RESULT_COLUMNS, widths)))
+    for row in rows:
+        cells = []
+        for name, w in zip(RESULT_COLUMNS, widths):
+            value = row[name]
+            cells.append(f"{value:>{w}.6g}" if isinstance(value, float) else f"{value:>{w}}")
+        print(" ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep RTGS simulator design points')
+    parser.add_argument('input', nargs='?', default='transformed_data.json',
+                        help='Input workload file (.npz or legacy .json)')
+    parser.add_argument('--output', default='sweep_results.csv', help='Output CSV table')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of worker processes (default: CPU count)')
+    for name, default in DEFAULT_POINT.items():
+        if name == "policy":
+            continue
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, nargs='+',
+                            default=[default], help=f'Values to sweep (default: {default})')
+    parser.add_argument('--policy', nargs='+', choices=sorted(SCHEDULERS),
+                        default=[DEFAULT_POINT["policy"]], help='PE scheduling policies to sweep')
+    parser.add_argument('--cache-dir', help='Reuse count maps and tile statistics cached in this directory')
+
+    args = parser.parse_args()
+    grid = {name: getattr(args, name) for name in DEFAULT_POINT}
+
+    print("🔄 Loading workload...")
+    workload = load_workload(args.input, with_indices=False)
+    coords, counts = workload.pixel_counts()
+    print(f"📈 Loaded {len(counts)} pixels with Gaussians")
+
+    points = expand_grid(grid)
+    print(f"🧮 Evaluating {len(points)} design points...")
+    cache = StageCache(args.cache_dir) if args.cache_dir else None
+    source = workload_hash(args.input) if cache else None
+    rows = run_sweep(coords, counts, grid, args.workers, preprocess_workload(workload), cache, source)
+    if cache:
+        print(f"🗃️ Cache {cache.summary()}")
+
+    print_table(rows)
+    write_table(rows, args.output)
+    print(f"✅ Saved sweep results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Vectorized tile workload engine for the RTGS simulator
+Turns the per-pixel Gaussian map into per-tile rendering workloads
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+@dataclass
+class TileStats:
+    """Per-tile workload statistics, each array shaped (tiles_y, tiles_x)"""
+    raw_max: np.ndarray
+    avg_max: np.ndarray
+    all_gaussian: np.ndarray
+    group_max: np.ndarray
+
+    @property
+    def tile_exec_times(self) -> np.ndarray:
+        """Per-tile execution cycles in row-major tile order"""
+        return self.group_max.ravel()
+
+    @property
+    def sum_all_gaussian(self) -> int:
+        return int(self.all_gaussian.sum())
+
+    @property
+    def sum_raw_max(self) -> int:
+        return int(self.raw_max.sum())
+
+    @property
+    def sum_avg_max(self) -> int:
+        return int(self.avg_max.sum())
+
+    @property
+    def sum_group_max(self) -> int:
+        return int(self.group_max.sum())
+
+    @property
+    def count_max(self) -> int:
+        return int(self.raw_max.max()) if self.raw_max.size else 0
+
+
+def parse_pixel_counts(pixel_counts: Dict[str, list]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the "u_v" keyed pixel map into coordinate and count arrays
+
+    Args:
+        pixel_counts: Dictionary mapping "u_v" coordinates to list of Gaussian indices
+
+    Returns:
+        (N, 2) int64 array of (u, v) coordinates and (N,) int32 array of counts
+    """
+    if not pixel_counts:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.int32)
+
+    # Parse every "u_v" key in one pass instead of a split per key
+    coords = np.array(
+        " ".join(pixel_counts.keys()).replace("_", " ").split(), dtype=np.int64
+    ).reshape(-1, 2)
+    counts = np.fromiter(
+        (len(value) if isinstance(value, list) else 0 for value in pixel_counts.values()),
+        dtype=np.int32,
+        count=len(pixel_counts),
+    )
+    return coords, counts
+
+
+def count_map_from_coords(coords: np.ndarray,
+                          counts: np.ndarray,
+                          width: int,
+                          height: int,
+                          tile_size_1: int = 16,
+                          tile_size_2: int = 16) -> np.ndarray:
+    """
+    Scatter per-pixel counts into a count map padded to whole tiles
+
+    Args:
+        coords: (N, 2) array of (u, v) pixel coordinates
+        counts: (N,) array of Gaussian counts per pixel
+        width: Image width
+        height: Image height
+        tile_size_1: Tile width in pixels
+        tile_size_2: Tile height in pixels
+
+    Returns:
+        int32 array of shape (padded_height, padded_width)
+    """
+    pad_width = (tile_size_1 - (width % tile_size_1)) % tile_size_1
+    pad_height = (tile_size_2 - (height % tile_size_2)) % tile_size_2
+    count_map = np.zeros((height + pad_height, width + pad_width), dtype=np.int32)
+    count_map[coords[:, 1], coords[:, 0]] = counts
+    return count_map
+
+
+def build_count_map(pixel_counts: Dict[str, list],
+                    width: int,
+                    height: int,
+                    tile_size_1: int = 16,
+                    tile_size_2: int = 16) -> np.ndarray:
+    """
+    Build the padded per-pixel Gaussian count map
+
+    Args:
+        pixel_counts: Dictionary mapping "u_v" coordinates to list of Gaussian indices
+        width: Image width
+        height: Image height
+        tile_size_1: Tile width in pixels
+        tile_size_2: Tile height in pixels
+
+    Returns:
+        int32 array of shape (padded_height, padded_width)
+    """
+    coords, counts = parse_pixel_counts(pixel_counts)
+    return count_map_from_coords(coords, counts, width, height, tile_size_1, tile_size_2)
+
+
+def tile_view(count_map: np.ndarray,
+              tile_size_1: int = 16,
+              tile_size_2: int = 16,
+              downsample_stride: int = 1) -> np.ndarray:
+    """
+    Reshape a padded count map into a (tiles_y, tiles_x, tile_size_2, tile_size_1)
+    view, optionally downsampled inside each tile
+    """
+    new_height, new_width = count_map.shape
+    tiles_y = new_height // tile_size_2
+    tiles_x = new_width // tile_size_1
+    tiles = count_map.reshape(tiles_y, tile_size_2, tiles_x, tile_size_1).swapaxes(1, 2)
+    return tiles[:, :, ::downsample_stride, ::downsample_stride]
+
+
+def pairing_group_max(tiles: np.ndarray, group: int = 2) -> np.ndarray:
+    """
+    Max pairing-group average for every tile
+
+    Each tile's samples are sorted; group k pairs the k-th block of the
+    group // 2 smallest samples with the k-th block of the group // 2 largest,
+    and its cost is the ceiling of the mean of the pair averages.
+
+    Args:
+        tiles: Array of per-tile samples shaped (..., h, w)
+        group: Group size, must be even
+
+    Returns:
+        Array of per-tile maxima over the group costs (0 for tiles with no group)
+    """
+    if group % 2 != 0:
+        raise ValueError("Group size must be even")
+
+    batch_shape = tiles.shape[:-2]
+    vals = np.sort(tiles.reshape(*batch_shape, -1), axis=-1)
+    n = vals.shape[-1]
+    half = group // 2
+    num_groups = n // group
+    if num_groups == 0:
+        return np.zeros(batch_shape, dtype=np.int64)
+
+    # Group k takes sorted[k*half:(k+1)*half] and sorted[n-(k+1)*half:n-k*half]
+    min_vals = vals[..., :num_groups * half].reshape(*batch_shape, num_groups, half)
+    max_vals = vals[..., n - num_groups * half:].reshape(*batch_shape, num_groups, half)
+    max_vals = max_vals[..., ::-1, :]
+    pair_avgs = (min_vals + max_vals) / 2
+    group_avgs = np.ceil(pair_avgs.mean(axis=-1))
+    return group_avgs.max(axis=-1).astype(np.int64)
+
+
+def compute_tile_stats(count_map: np.ndarray,
+                       tile_size_1: int = 16,
+                       tile_size_2: int = 16,
+                       downsample_stride: int = 4,
+                       group: int = 2) -> TileStats:
+    """
+    Compute raw max, average max, Gaussian sum and pairing-group max for all tiles
+
+    Args:
+        count_map: Padded per-pixel Gaussian count map
+        tile_size_1: Tile width in pixels
+        tile_size_2: Tile height in pixels
+        downsample_stride: Sampling stride inside each tile
+        group: Pairing group size, must be even
+
+    Returns:
+        TileStats with one entry per tile
+    """
+    tiles = tile_view(count_map, tile_size_1, tile_size_2, downsample_stride)
+    return TileStats(
+        raw_max=tiles.max(axis=(-2, -1)).astype(np.int64),
+        avg_max=np.ceil(tiles.mean(axis=(-2, -1))).astype(np.int64),
+        all_gaussian=tiles.sum(axis=(-2, -1), dtype=np.int64),
+        group_max=pairing_group_max(tiles, group),
+    )
@@ -0,0 +1,336 @@
+"""
+Pixel-to-Gaussian workload storage shared by transform.py and the simulator
+
+Two on-disk formats are supported, chosen by file extension:
+    .npz  - compact CSR layout: pixel coords, row offsets and Gaussian indices
+    .json - legacy {"pixels": {"u_v": [indices...]}} format
+
+Multi-frame sequences are either directories of per-frame files named by
+sequence_frame_path() or one chunked .npz holding a member group per frame.
+"""
+
+import itertools
+import json
+import os
+import zipfile
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from rtgs_sim.tile_workload import parse_pixel_counts
+
+
+@dataclass
+class PixelWorkload:
+    """
+    CSR mapping of covered pixels to the Gaussians projected onto them
+
+    The Gaussians of pixel i (at coords[i] = (u, v)) are
+    indices[offsets[i]:offsets[i + 1]].
+
+    With tile_size > 1 each entry is a whole tile_size x tile_size block
+    (coords are tile indices) whose Gaussians apply to every pixel of the
+    block, as produced by the footprint-aware splat projection.
+
+    num_gaussians and num_visible record how many Gaussians were loaded and
+    how many survived culling, when the producer knows them.
+    """
+    coords: np.ndarray   # (N, 2) int32 (u, v)
+    offsets: np.ndarray  # (N + 1,) int64
+    indices: np.ndarray  # (offsets[-1],) int32 Gaussian ids
+    width: Optional[int] = None
+    height: Optional[int] = None
+    tile_size: int = 1
+    num_gaussians: Optional[int] = None
+    num_visible: Optional[int] = None
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Number of Gaussians per covered pixel"""
+        return np.diff(self.offsets).astype(np.int32)
+
+    @property
+    def num_pixels(self) -> int:
+        return int(self.coords.shape[0])
+
+    @property
+    def total_gaussians(self) -> int:
+        return int(self.offsets[-1]) if self.offsets.size else 0
+
+    def pixel_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-pixel (coords, counts), expanding tile entries to their pixels
+
+        Returns:
+            (M, 2) int64 array of (u, v) coordinates and (M,) int32 counts
+        """
+        coords = self.coords.astype(np.int64)
+        counts = self.counts
+        if self.tile_size == 1:
+            return coords, counts
+
+        ts = self.tile_size
+        dv, du = np.meshgrid(np.arange(ts), np.arange(ts), indexing="ij")
+        block = np.stack([du.ravel(), dv.ravel()], axis=1)
+        pixels = (coords[:, None, :] * ts + block[None, :, :]).reshape(-1, 2)
+        counts = np.repeat(counts, ts * ts)
+        if self.width is not None and self.height is not None:
+            inside = (pixels[:, 0] < self.width) & (pixels[:, 1] < self.height)
+            pixels, counts = pixels[inside], counts[inside]
+        return pixels, counts
+
+    @staticmethod
+    def empty(width: Optional[int] = None, height: Optional[int] = None) -> "PixelWorkload":
+        return PixelWorkload(
+            np.zeros((0, 2), dtype=np.int32),
+            np.zeros(1, dtype=np.int64),
+            np.zeros(0, dtype=np.int32),
+            width,
+            height,
+        )
+
+
+def from_pixel_dict(pixels: Dict[str, List],
+                    width: Optional[int] = None,
+                    height: Optional[int] = None) -> PixelWorkload:
+    """Convert a legacy "u_v" keyed dictionary into a PixelWorkload"""
+    if not pixels:
+        return PixelWorkload.empty(width, height)
+
+    coords, counts = parse_pixel_counts(pixels)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    indices = np.fromiter(
+        itertools.chain.from_iterable(
+            value for value in pixels.values() if isinstance(value, list)
+        ),
+        dtype=np.int32,
+        count=int(offsets[-1]),
+    )
+    return PixelWorkload(coords.astype(np.int32), offsets, indices, width, height)
+
+
+def from_pixel_ids(pixel_ids: np.ndarray,
+                   gaussian_ids: np.ndarray,
+                   width: int,
+                   height: int) -> PixelWorkload:
+    """
+    Group (pixel, Gaussian) hits into a PixelWorkload
+
+    Args:
+        pixel_ids: Linear pixel index v * width + u of every hit
+        gaussian_ids: Gaussian index of every hit
+        width: Image width
+        height: Image height
+
+    Returns:
+        PixelWorkload whose pixels appear in order of their first hit and
+        whose per-pixel Gaussian lists keep the hit order
+    """
+    if pixel_ids.size == 0:
+        return PixelWorkload.empty(width, height)
+
+    order = np.argsort(pixel_ids, kind="stable")
+    sorted_ids = pixel_ids[order]
+    unique_ids, starts, counts = np.unique(sorted_ids, return_index=True, return_counts=True)
+
+    # Reorder pixel groups by their first hit so the output is deterministic
+    # and matches the insertion order of the legacy dictionary
+    first_hit = order[starts]
+    group_order = np.argsort(first_hit, kind="stable")
+    unique_ids = unique_ids[group_order]
+    counts = counts[group_order]
+    starts = starts[group_order]
+
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    # Position in sorted order of every element of every reordered group
+    gather = np.repeat(starts - offsets[:-1], counts) + np.arange(offsets[-1])
+    indices = gaussian_ids[order[gather]].astype(np.int32)
+
+    coords = np.stack([unique_ids % width, unique_ids // width], axis=1).astype(np.int32)
+    return PixelWorkload(coords, offsets, indices, width, height)
+
+
+def to_pixel_dict(workload: PixelWorkload) -> Dict[str, List]:
+    """Convert a PixelWorkload into the legacy "u_v" keyed dictionary"""
+    pixels = {}
+    indices = workload.indices.tolist()
+    offsets = workload.offsets.tolist()
+    for i, (u, v) in enumerate(workload.coords.tolist()):
+        pixels[f"{u}_{v}"] = indices[offsets[i]:offsets[i + 1]]
+    return pixels
+
+
+def with_gaussian_counts(workload: PixelWorkload, num_gaussians: int) -> PixelWorkload:
+    """
+    Record the loaded and visible Gaussian counts on a freshly projected workload
+
+    Args:
+        workload: Workload holding its Gaussian indices
+        num_gaussians: Number of Gaussians in the point cloud
+
+    Returns:
+        Copy of the workload with num_gaussians and num_visible set; a
+        Gaussian is visible if it reaches at least one pixel or tile
+    """
+    num_visible = int(np.unique(workload.indices).size)
+    return replace(workload, num_gaussians=int(num_gaussians), num_visible=num_visible)
+
+
+def _workload_arrays(workload: PixelWorkload) -> Dict[str, np.ndarray]:
+    """Arrays stored for one workload in the .npz layout"""
+    image_size = [workload.width or -1, workload.height or -1]
+    gaussian_counts = [
+        -1 if workload.num_gaussians is None else workload.num_gaussians,
+        -1 if workload.num_visible is None else workload.num_visible,
+    ]
+    return {
+        "coords": workload.coords.astype(np.int32),
+        "offsets": workload.offsets.astype(np.int64),
+        "indices": workload.indices.astype(np.int32),
+        "image_size": np.array(image_size, dtype=np.int64),
+        "tile_size": np.array(workload.tile_size, dtype=np.int64),
+        "gaussian_counts": np.array(gaussian_counts, dtype=np.int64),
+    }
+
+
+def _workload_from_npz(data, prefix: str = "", with_indices: bool = True) -> PixelWorkload:
+    """Read one workload from an open NpzFile, optionally under a member prefix"""
+    width, height = (int(x) for x in data[prefix + "image_size"])
+    if with_indices:
+        indices = data[prefix + "indices"]
+    else:
+        indices = np.zeros(0, dtype=np.int32)
+    if prefix + "tile_size" in data.files:
+        tile_size = int(data[prefix + "tile_size"])
+    else:
+        tile_size = 1
+    if prefix + "gaussian_counts" in data.files:
+        num_gaussians, num_visible = (int(x) for x in data[prefix + "gaussian_counts"])
+    else:
+        num_gaussians = num_visible = -1
+    return PixelWorkload(
+        data[prefix + "coords"],
+        data[prefix + "offsets"],
+        indices,
+        width if width > 0 else None,
+        height if height > 0 else None,
+        tile_size,
+        num_gaussians if num_gaussians >= 0 else None,
+        num_visible if num_visible >= 0 else None,
+    )
+
+
+def save_workload(workload: PixelWorkload, output_file: str):
+    """Save a workload as .npz (CSR) or legacy .json depending on the extension"""
+    if output_file.endswith(".json"):
+        data = {"pixels": to_pixel_dict(workload)}
+        if workload.tile_size != 1:
+            data["tile_size"] = workload.tile_size
+            data["image_size"] = [workload.width, workload.height]
+        if workload.num_gaussians is not None:
+            data["num_gaussians"] = workload.num_gaussians
+            data["num_visible"] = workload.num_visible
+        with open(output_file, 'w') as f:
+            json.dump(data, f, indent=2)
+    elif output_file.endswith(".npz"):
+        np.savez(output_file, **_workload_arrays(workload))
+    else:
+        raise ValueError(f"Unsupported workload format: {output_file} (use .npz or .json)")
+
+
+def load_workload(input_file: str, with_indices: bool = True) -> PixelWorkload:
+    """
+    Load a workload saved as .npz (CSR) or legacy .json
+
+    Args:
+        input_file: Path to the workload file
+        with_indices: Also read the Gaussian index array; the simulator only
+                      needs per-pixel counts and can skip it for .npz files
+
+    Returns:
+        PixelWorkload (empty if the file does not exist)
+    """
+    try:
+        if input_file.endswith(".npz"):
+            with np.load(input_file) as data:
+                return _workload_from_npz(data, with_indices=with_indices)
+        with open(input_file, "r") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return PixelWorkload.empty()
+    workload = from_pixel_dict(data["pixels"], *data.get("image_size", (None, None)))
+    workload.tile_size = data.get("tile_size", 1)
+    workload.num_gaussians = data.get("num_gaussians")
+    workload.num_visible = data.get("num_visible")
+    return workload
+
+
+def sequence_frame_path(sequence_dir: str, frame_id: int, file_format: str = "npz") -> str:
+    """Path of one frame's workload inside a sequence directory"""
+    return os.path.join(sequence_dir, f"frame_{int(frame_id):06d}.{file_format}")
+
+
+class WorkloadSequenceWriter:
+    """
+    Stream per-frame workloads into one chunked .npz file
+
+    Each frame is stored as its own group of members ("frame_000012/coords",
+    ...), written as soon as it is produced, so neither writing nor reading
+    a sequence needs more than one frame in memory.
+    """
+
+    def __init__(self, output_file: str):
+        self.output_file = output_file
+        self._zip = zipfile.ZipFile(output_file, "w", zipfile.ZIP_STORED, allowZip64=True)
+
+    def write(self, frame_id: int, workload: PixelWorkload):
+        prefix = f"frame_{int(frame_id):06d}/"
+        for name, array in _workload_arrays(workload).items():
+            with self._zip.open(prefix + name + ".npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, np.asanyarray(array), allow_pickle=False)
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_workload_sequence(path: str,
+                           with_indices: bool = True) -> Iterator[Tuple[int, PixelWorkload]]:
+    """
+    Lazily iterate the frames of a workload sequence
+
+    Accepts a directory of per-frame files (frame_<id>.npz / .json), a
+    chunked .npz written by WorkloadSequenceWriter, or a single workload
+    file (yielded as frame 0). Frames are read one at a time.
+
+    Yields:
+        (frame_id, PixelWorkload) in frame order
+    """
+    if os.path.isdir(path):
+        frame_files = sorted(
+            name for name in os.listdir(path)
+            if name.startswith("frame_") and name.endswith((".npz", ".json"))
+        )
+        for name in frame_files:
+            frame_id = int(os.path.splitext(name)[0][len("frame_"):])
+            yield frame_id, load_workload(os.path.join(path, name), with_indices)
+        return
+
+    if path.endswith(".npz") and os.path.exists(path):
+        with np.load(path) as data:
+            if "coords" not in data.files:
+                prefixes = sorted({name.split("/")[0] for name in data.files})
+                for prefix in prefixes:
+                    frame_id = int(prefix[len("frame_"):])
+                    yield frame_id, _workload_from_npz(data, prefix + "/", with_indices)
+                return
+
+    yield 0, load_workload(path, with_indices)
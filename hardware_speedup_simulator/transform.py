@@ -5,35 +5,208 @@ Converts 3D point cloud data to 2D pixel mapping with Gaussian counts
 """
 
 import json
+import os
 import numpy as np
 import argparse
-from typing import Dict, List, Tuple
+from dataclasses import replace
+from typing import Dict, Iterator, List, Tuple
 
-def load_point_cloud(json_file: str) -> List[Dict]:
-    """Load point cloud data from JSON file"""
+import yaml
+
+from rtgs_sim.workload_io import (
+    PixelWorkload,
+    WorkloadSequenceWriter,
+    from_pixel_ids,
+    save_workload,
+    sequence_frame_path,
+    with_gaussian_counts,
+)
+
+# Near clipping distance used by the rasterizer's in_frustum()
+NEAR_PLANE = 0.2
+
+# Vertices decoded per block by the streaming JSON reader
+JSON_BLOCK_SIZE = 1 << 16
+
+# PLY property types and their NumPy equivalents
+PLY_TYPES = {
+    'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2', 'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4', 'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4', 'double': 'f8', 'float64': 'f8',
+}
+
+def iter_json_vertices(json_file: str, chunk_size: int = 1 << 20) -> Iterator[Dict]:
+    """
+    Yield the objects of the top-level "vertex" array one at a time
+
+    The file is read in chunks and decoded incrementally, so only the
+    current chunk and vertex are held as Python objects.
+    """
+    decoder = json.JSONDecoder()
     with open(json_file, 'r') as f:
-        data = json.load(f)
-    return data['vertex']
+        buffer = f.read(chunk_size)
+
+        # Locate the start of the vertex array
+        while True:
+            key = buffer.find('"vertex"')
+            bracket = buffer.find('[', key) if key >= 0 else -1
+            if bracket >= 0:
+                pos = bracket + 1
+                break
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buffer += chunk
+
+        while True:
+            # Skip separators, reading on if the buffer runs out
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buffer):
+                    break
+                buffer, pos = f.read(chunk_size), 0
+                if not buffer:
+                    return
+            if buffer[pos] == ']':
+                return
+            try:
+                vertex, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Vertex split across chunks
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield vertex
+            pos = end
+
+def load_point_cloud(json_file: str) -> np.ndarray:
+    """
+    Load point cloud data from JSON file
+
+    Vertices are streamed and converted block by block into float64
+    columns, so peak memory is dominated by the returned array instead of
+    per-vertex Python objects.
+
+    Returns:
+        Structured array with one float64 field per vertex attribute;
+        attributes missing from a vertex are NaN
+    """
+    names: Dict[str, None] = {}
+    blocks: List[Dict[str, np.ndarray]] = []
+    block: List[Dict] = []
+
+    def flush():
+        for vertex in block:
+            names.update(dict.fromkeys(vertex))
+        blocks.append({
+            name: np.fromiter(
+                (vertex.get(name, np.nan) for vertex in block), dtype=np.float64, count=len(block)
+            )
+            for name in names
+        })
+        block.clear()
+
+    for vertex in iter_json_vertices(json_file):
+        block.append(vertex)
+        if len(block) == JSON_BLOCK_SIZE:
+            flush()
+    if block:
+        flush()
+    if not blocks:
+        return np.zeros(0, dtype=[(name, 'f8') for name in ('x', 'y', 'z')])
+
+    # Attributes first seen in a later block are NaN in the earlier ones
+    sizes = [len(next(iter(columns.values()))) for columns in blocks]
+    points = np.empty(sum(sizes), dtype=[(name, 'f8') for name in names])
+    start = 0
+    for size in sizes:
+        columns = blocks.pop(0)
+        for name in names:
+            points[name][start:start + size] = columns.get(name, np.nan)
+        start += size
+    return points
+
+def load_ply(ply_file: str) -> np.ndarray:
+    """
+    Memory-map the vertices of a binary PLY written by GaussianModel.save_ply
+
+    Only the header is parsed; vertex data stays on disk and is paged in
+    as fields are accessed.
+
+    Returns:
+        Read-only structured np.memmap with one field per vertex property,
+        in the file's own types
+    """
+    with open(ply_file, 'rb') as f:
+        if f.readline().strip() != b'ply':
+            raise ValueError(f"{ply_file} is not a PLY file")
+        fmt = None
+        elements = []
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f"Truncated PLY header in {ply_file}")
+            tokens = line.decode('ascii').split()
+            if not tokens or tokens[0] in ('comment', 'obj_info'):
+                continue
+            if tokens[0] == 'end_header':
+                break
+            if tokens[0] == 'format':
+                fmt = tokens[1]
+            elif tokens[0] == 'element':
+                elements.append((tokens[1], int(tokens[2]), []))
+            elif tokens[0] == 'property':
+                if tokens[1] == 'list':
+                    raise ValueError(f"List properties are not supported in {ply_file}")
+                elements[-1][2].append((tokens[2], PLY_TYPES[tokens[1]]))
+        offset = f.tell()
+
+    byte_order = {'binary_little_endian': '<', 'binary_big_endian': '>'}.get(fmt)
+    if byte_order is None:
+        raise ValueError(f"Unsupported PLY format '{fmt}' in {ply_file}, expected binary")
+    for name, count, properties in elements:
+        dtype = np.dtype([(prop, byte_order + kind) for prop, kind in properties])
+        if name == 'vertex':
+            if count == 0:
+                return np.zeros(0, dtype=dtype)
+            return np.memmap(ply_file, dtype=dtype, mode='r', offset=offset, shape=(count,))
+        offset += dtype.itemsize * count
+    raise ValueError(f"No vertex element in {ply_file}")
 
-def project_3d_to_2d(points: List[Dict], 
+def load_points(input_file: str) -> np.ndarray:
+    """Load a point cloud from a Gaussian .ply or a point_cloud.json"""
+    if input_file.endswith('.ply'):
+        return load_ply(input_file)
+    return load_point_cloud(input_file)
+
+def xyz_columns(points: np.ndarray) -> np.ndarray:
+    """Stack the x, y, z fields of a structured point array into (N, 3) float64"""
+    return np.stack([points['x'], points['y'], points['z']], axis=1).astype(np.float64)
+
+def project_3d_to_2d(points: np.ndarray, 
                      width: int = 1752, 
                      height: int = 1160,
                      fov: float = 60.0,
-                     camera_distance: float = 10.0) -> Dict[str, List]:
+                     camera_distance: float = 10.0) -> PixelWorkload:
     """
     Project 3D points to 2D pixel coordinates
     
     Args:
-        points: List of 3D points with x, y, z coordinates
+        points: Structured point array with x, y, z fields, or (N, 3) array
         width: Output image width
         height: Output image height
         fov: Field of view in degrees
         camera_distance: Distance from camera to scene center
     
     Returns:
-        Dictionary mapping "u_v" coordinates to list of Gaussian indices
+        PixelWorkload mapping each covered pixel to its Gaussian indices
     """
-    pixels = {}
+    xyz = xyz_columns(points) if points.dtype.names else np.asarray(points, dtype=np.float64)
     
     # Convert FOV to radians
     fov_rad = np.radians(fov)
@@ -41,71 +214,384 @@ def project_3d_to_2d(points: List[Dict],
     # Calculate focal length
     focal_length = width / (2 * np.tan(fov_rad / 2))
     
-    for i, point in enumerate(points):
-        x, y, z = point['x'], point['y'], point['z']
-        
-        # Simple perspective projection
-        # Move camera to positive z and project
-        z_proj = z + camera_distance
-        
-        if z_proj > 0:  # Only project points in front of camera
-            # Project to 2D
-            u = int((x * focal_length / z_proj) + width / 2)
-            v = int((y * focal_length / z_proj) + height / 2)
-            
-            # Clamp to image boundaries
-            u = max(0, min(u, width - 1))
-            v = max(0, min(v, height - 1))
-            
-            # Create key in "u_v" format
-            key = f"{u}_{v}"
-            
-            if key not in pixels:
-                pixels[key] = []
-            pixels[key].append(i)  # Store Gaussian index
+    # Simple perspective projection
+    # Move camera to positive z and project
+    z_proj = xyz[:, 2] + camera_distance
     
-    return pixels
-
-def save_simulator_format(pixels: Dict[str, List], output_file: str):
-    """Save data in simulator-compatible format"""
-    data = {"pixels": pixels}
+    # Only project points in front of camera
+    visible = np.flatnonzero(z_proj > 0)
+    x, y, z_proj = xyz[visible, 0], xyz[visible, 1], z_proj[visible]
     
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Project to 2D, truncating toward zero like int(); pre-clip so far
+    # off-screen points cannot overflow the integer cast
+    u = np.clip((x * focal_length / z_proj) + width / 2, -1, width).astype(np.int64)
+    v = np.clip((y * focal_length / z_proj) + height / 2, -1, height).astype(np.int64)
     
-    print(f"✅ Saved simulator-compatible format to {output_file}")
-    print(f"📊 Total pixels with Gaussians: {len(pixels)}")
+    # Clamp to image boundaries
+    u = np.clip(u, 0, width - 1)
+    v = np.clip(v, 0, height - 1)
     
-    # Count total Gaussians
-    total_gaussians = sum(len(gaussian_list) for gaussian_list in pixels.values())
-    print(f"🎯 Total Gaussians: {total_gaussians}")
+    # Group Gaussian indices per pixel
+    workload = from_pixel_ids(v * width + u, visible, width, height)
+    return with_gaussian_counts(workload, xyz.shape[0])
+
+def quaternion_to_rotation(q: np.ndarray) -> np.ndarray:
+    """Convert (N, 4) quaternions (r, x, y, z) to (N, 3, 3) rotation matrices"""
+    q = q / np.linalg.norm(q, axis=1, keepdims=True)
+    r, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    R = np.empty((q.shape[0], 3, 3), dtype=np.float64)
+    R[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    R[:, 0, 1] = 2 * (x * y - r * z)
+    R[:, 0, 2] = 2 * (x * z + r * y)
+    R[:, 1, 0] = 2 * (x * y + r * z)
+    R[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    R[:, 1, 2] = 2 * (y * z - r * x)
+    R[:, 2, 0] = 2 * (x * z - r * y)
+    R[:, 2, 1] = 2 * (y * z + r * x)
+    R[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return R
+
+def covariance_3d(points: np.ndarray, scale_modifier: float = 1.0) -> np.ndarray:
+    """
+    World-space 3D covariance of every Gaussian, Sigma = R S S^T R^T
+
+    Args:
+        points: Structured point array with scale_0..2 (log scale) and rot_0..3 fields
+        scale_modifier: Extra scale factor, as in the rasterizer
+
+    Returns:
+        (N, 3, 3) float64 covariance matrices
+    """
+    scales = np.exp(np.stack([points[f'scale_{i}'] for i in range(3)], axis=1).astype(np.float64)) * scale_modifier
+    rots = np.stack([points[f'rot_{i}'] for i in range(4)], axis=1).astype(np.float64)
+    M = quaternion_to_rotation(rots) * scales[:, None, :]
+    return M @ M.transpose(0, 2, 1)
+
+def _footprint_hits(p_view: np.ndarray,
+                    cov3d: np.ndarray,
+                    view_rotation: np.ndarray,
+                    fx: float, fy: float, cx: float, cy: float,
+                    width: int, height: int,
+                    gaussian_ids: np.ndarray,
+                    block: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(tile id, Gaussian id) pair for every tile each Gaussian overlaps"""
+    tiles_x = (width + block - 1) // block
+    tiles_y = (height + block - 1) // block
+
+    # Near culling as in in_frustum()
+    keep = p_view[:, 2] > NEAR_PLANE
+    p_view, cov3d, gaussian_ids = p_view[keep], cov3d[keep], gaussian_ids[keep]
+    tx, ty, tz = p_view[:, 0], p_view[:, 1], p_view[:, 2]
+
+    limx = 1.3 * (width / (2 * fx))
+    limy = 1.3 * (height / (2 * fy))
+    txc = np.clip(tx / tz, -limx, limx) * tz
+    tyc = np.clip(ty / tz, -limy, limy) * tz
+
+    J = np.zeros((p_view.shape[0], 2, 3), dtype=np.float64)
+    J[:, 0, 0] = fx / tz
+    J[:, 0, 2] = -(fx * txc) / (tz * tz)
+    J[:, 1, 1] = fy / tz
+    J[:, 1, 2] = -(fy * tyc) / (tz * tz)
+    T = J @ view_rotation
+    cov2d = T @ cov3d @ T.transpose(0, 2, 1)
+    a = cov2d[:, 0, 0] + 0.3
+    b = cov2d[:, 0, 1]
+    c = cov2d[:, 1, 1] + 0.3
+
+    det = a * c - b * b
+    mid = 0.5 * (a + c)
+    lambda1 = mid + np.sqrt(np.maximum(0.1, mid * mid - det))
+    radius = np.ceil(3.0 * np.sqrt(lambda1))
+
+    u = tx * fx / tz + cx
+    v = ty * fy / tz + cy
+
+    # Bounding rectangle of tiles, as getRect()
+    valid = (det != 0) & np.isfinite(radius) & np.isfinite(u) & np.isfinite(v)
+    u, v, radius, gaussian_ids = u[valid], v[valid], radius[valid], gaussian_ids[valid]
+    x0 = np.clip(np.trunc((u - radius) / block), 0, tiles_x).astype(np.int64)
+    y0 = np.clip(np.trunc((v - radius) / block), 0, tiles_y).astype(np.int64)
+    x1 = np.clip(np.trunc((u + radius + block - 1) / block), 0, tiles_x).astype(np.int64)
+    y1 = np.clip(np.trunc((v + radius + block - 1) / block), 0, tiles_y).astype(np.int64)
+    span_x = x1 - x0
+    tiles_touched = span_x * (y1 - y0)
+
+    # Duplicate each Gaussian once per touched tile
+    hit_gaussian = np.repeat(np.arange(tiles_touched.shape[0]), tiles_touched)
+    starts = np.cumsum(tiles_touched) - tiles_touched
+    k = np.arange(hit_gaussian.shape[0]) - starts[hit_gaussian]
+    hit_tx = x0[hit_gaussian] + k % span_x[hit_gaussian]
+    hit_ty = y0[hit_gaussian] + k // span_x[hit_gaussian]
+    return hit_ty * tiles_x + hit_tx, gaussian_ids[hit_gaussian].astype(np.int32)
+
+def splat_tiles(p_view: np.ndarray,
+                cov3d: np.ndarray,
+                view_rotation: np.ndarray,
+                fx: float, fy: float, cx: float, cy: float,
+                width: int, height: int,
+                gaussian_ids: np.ndarray,
+                block: int = 16,
+                chunk_size: int = 1 << 18) -> PixelWorkload:
+    """
+    Tiles touched by every Gaussian's 3-sigma screen-space footprint
+
+    Mirrors preprocessCUDA + duplicateWithKeys of the CUDA rasterizer: EWA
+    2D covariance with the 0.3 low-pass filter, radius = ceil(3 sqrt(lambda_max)),
+    and one (tile, Gaussian) entry per tile of the bounding rectangle.
+    Gaussians are processed in chunks to bound temporary memory.
+
+    Args:
+        p_view: (N, 3) camera-space means
+        cov3d: (N, 3, 3) world-space covariances
+        view_rotation: (3, 3) world-to-camera rotation
+        fx, fy, cx, cy: Pinhole intrinsics in pixels
+        width, height: Image size
+        gaussian_ids: (N,) index of each Gaussian in the point cloud
+        block: Rasterizer tile size
+        chunk_size: Gaussians processed per vectorized batch
+
+    Returns:
+        Tile-granular PixelWorkload (tile_size = block)
+    """
+    tiles_x = (width + block - 1) // block
+    tiles_y = (height + block - 1) // block
+    tile_ids, hit_ids = [], []
+    for start in range(0, p_view.shape[0], chunk_size):
+        end = start + chunk_size
+        tiles, ids = _footprint_hits(
+            p_view[start:end], cov3d[start:end], view_rotation,
+            fx, fy, cx, cy, width, height, gaussian_ids[start:end], block,
+        )
+        tile_ids.append(tiles)
+        hit_ids.append(ids)
+    if not tile_ids:
+        return PixelWorkload.empty(width, height)
+
+    tiles = from_pixel_ids(np.concatenate(tile_ids), np.concatenate(hit_ids), tiles_x, tiles_y)
+    return replace(tiles, width=width, height=height, tile_size=block)
+
+def project_splats(points: np.ndarray,
+                   width: int = 1752,
+                   height: int = 1160,
+                   fov: float = 60.0,
+                   camera_distance: float = 10.0,
+                   block: int = 16) -> PixelWorkload:
+    """
+    Footprint-aware projection with the same synthetic camera as project_3d_to_2d
+
+    Every Gaussian is counted in each rasterizer tile its 3-sigma ellipse
+    overlaps instead of only at its center pixel.
+
+    Args:
+        points: Structured point array with x, y, z, scale_* and rot_* fields
+        width: Output image width
+        height: Output image height
+        fov: Field of view in degrees
+        camera_distance: Distance from camera to scene center
+        block: Rasterizer tile size
+
+    Returns:
+        Tile-granular PixelWorkload
+    """
+    xyz = xyz_columns(points)
+    focal_length = width / (2 * np.tan(np.radians(fov) / 2))
+    p_view = xyz + np.array([0.0, 0.0, camera_distance])
+    workload = splat_tiles(
+        p_view, covariance_3d(points), np.eye(3),
+        focal_length, focal_length, width / 2, height / 2,
+        width, height, np.arange(xyz.shape[0]), block,
+    )
+    return with_gaussian_counts(workload, xyz.shape[0])
+
+def load_camera_config(config_file: str) -> Dict:
+    """
+    Read pinhole intrinsics from a SLAM config YAML (Dataset.Calibration)
+
+    Stereo configs use the rectified left camera (cam0.opt).
+
+    Returns:
+        Dictionary with fx, fy, cx, cy, width, height
+    """
+    with open(config_file, 'r') as f:
+        config = yaml.full_load(f)
+    calibration = config.get("Dataset", {}).get("Calibration")
+    if calibration is None:
+        raise ValueError(f"No Dataset.Calibration section in {config_file}")
+    intrinsics = calibration["cam0"]["opt"] if "cam0" in calibration else calibration
+    return {
+        "fx": float(intrinsics["fx"]),
+        "fy": float(intrinsics["fy"]),
+        "cx": float(intrinsics["cx"]),
+        "cy": float(intrinsics["cy"]),
+        "width": int(calibration["width"]),
+        "height": int(calibration["height"]),
+    }
+
+def load_trajectory(json_file: str, key: str = "trj_est") -> Tuple[List[int], np.ndarray]:
+    """
+    Load keyframe poses written by eval_ate to plot/trj_*.json
+
+    Args:
+        json_file: Trajectory JSON file
+        key: "trj_est" (estimated) or "trj_gt" (ground truth) camera-to-world poses
+
+    Returns:
+        Keyframe ids and (F, 4, 4) world-to-camera matrices
+    """
+    with open(json_file, 'r') as f:
+        data = json.load(f)
+    c2w = np.asarray(data[key], dtype=np.float64).reshape(-1, 4, 4)
+    frame_ids = data.get("trj_id", list(range(c2w.shape[0])))
+    return frame_ids, np.linalg.inv(c2w)
+
+def project_centers(p_view: np.ndarray,
+                    fx: float, fy: float, cx: float, cy: float,
+                    width: int, height: int,
+                    gaussian_ids: np.ndarray) -> PixelWorkload:
+    """
+    Project camera-space centers through a pinhole camera, culling points
+    behind the near plane or outside the image
+
+    Returns:
+        PixelWorkload mapping each covered pixel to its Gaussian indices
+    """
+    z = p_view[:, 2]
+    front = z > NEAR_PLANE
+    p_view, z, gaussian_ids = p_view[front], z[front], gaussian_ids[front]
+    u = np.floor(p_view[:, 0] * fx / z + cx)
+    v = np.floor(p_view[:, 1] * fy / z + cy)
+    inside = (u >= 0) & (u < width) & (v >= 0) & (v < height)
+    u = u[inside].astype(np.int64)
+    v = v[inside].astype(np.int64)
+    return from_pixel_ids(v * width + u, gaussian_ids[inside], width, height)
+
+def project_trajectory(points: np.ndarray,
+                       camera: Dict,
+                       w2c: np.ndarray,
+                       mode: str = 'center',
+                       block: int = 16) -> Iterator[PixelWorkload]:
+    """
+    Project the point cloud from every pose of a trajectory
+
+    Per-Gaussian data (positions, 3D covariances) is prepared once and each
+    view is then transformed in one batched matrix product.
+
+    Args:
+        points: Structured point array (x, y, z and, for splat mode, scale_*/rot_*)
+        camera: Intrinsics as returned by load_camera_config
+        w2c: (F, 4, 4) world-to-camera matrices
+        mode: 'center' or 'splat'
+        block: Rasterizer tile size for splat mode
+
+    Yields:
+        One PixelWorkload per pose
+    """
+    xyz = xyz_columns(points)
+    gaussian_ids = np.arange(xyz.shape[0])
+    cov3d = covariance_3d(points) if mode == 'splat' else None
+    intrinsics = (camera["fx"], camera["fy"], camera["cx"], camera["cy"],
+                  camera["width"], camera["height"])
+    for pose in w2c:
+        p_view = xyz @ pose[:3, :3].T + pose[:3, 3]
+        if mode == 'splat':
+            workload = splat_tiles(p_view, cov3d, pose[:3, :3], *intrinsics, gaussian_ids, block)
+        else:
+            workload = project_centers(p_view, *intrinsics, gaussian_ids)
+        yield with_gaussian_counts(workload, xyz.shape[0])
+
+def save_simulator_format(workload: PixelWorkload, output_file: str):
+    """
+    Save data in simulator-compatible format
+
+    The format follows the file extension: .npz writes the compact CSR
+    layout, .json the legacy {"pixels": {"u_v": [...]}} dictionary.
+    """
+    save_workload(workload, output_file)
+    
+    print(f"✅ Saved simulator-compatible format to {output_file}")
+    if workload.tile_size == 1:
+        print(f"📊 Total pixels with Gaussians: {workload.num_pixels}")
+        
+        # Count total Gaussians
+        print(f"🎯 Total Gaussians: {workload.total_gaussians}")
+    else:
+        print(f"📊 Total {workload.tile_size}x{workload.tile_size} tiles with Gaussians: {workload.num_pixels}")
+        print(f"🎯 Total tile-Gaussian pairs: {workload.total_gaussians}")
+    if workload.num_gaussians is not None:
+        print(f"👁️ Visible Gaussians: {workload.num_visible} of {workload.num_gaussians}")
 
 def main():
     parser = argparse.ArgumentParser(description='Transform point cloud to simulator format')
-    parser.add_argument('input', help='Input point_cloud.json file')
-    parser.add_argument('output', help='Output simulator-compatible JSON file')
+    parser.add_argument('input', help='Input point_cloud.json or Gaussian .ply file')
+    parser.add_argument('output', help='Output simulator file (.npz binary or legacy .json), '
+                                       'or with --trajectory an output directory or chunked .npz')
     parser.add_argument('--width', type=int, default=1752, help='Output image width')
     parser.add_argument('--height', type=int, default=1160, help='Output image height')
     parser.add_argument('--fov', type=float, default=60.0, help='Field of view in degrees')
     parser.add_argument('--camera-distance', type=float, default=10.0, help='Camera distance')
+    parser.add_argument('--mode', choices=['center', 'splat'], default='center',
+                        help='center: one pixel per Gaussian; splat: every tile its 3-sigma footprint overlaps')
+    parser.add_argument('--block', type=int, default=16, help='Rasterizer tile size for splat mode')
+    parser.add_argument('--config', help='SLAM config YAML providing the camera calibration')
+    parser.add_argument('--trajectory', help='Keyframe trajectory JSON written by eval_ate (plot/trj_*.json)')
+    parser.add_argument('--trajectory-key', choices=['trj_est', 'trj_gt'], default='trj_est',
+                        help='Which poses of the trajectory to use')
+    parser.add_argument('--format', choices=['npz', 'json'], default='npz',
+                        help='Per-frame file format when --trajectory writes a directory')
     
     args = parser.parse_args()
     
     print("🔄 Loading point cloud data...")
-    points = load_point_cloud(args.input)
+    points = load_points(args.input)
     print(f"📈 Loaded {len(points)} 3D points")
     
+    if args.trajectory:
+        if not args.config:
+            parser.error("--trajectory requires --config for the camera calibration")
+        camera = load_camera_config(args.config)
+        frame_ids, w2c = load_trajectory(args.trajectory, args.trajectory_key)
+        print(f"🎥 Projecting from {len(frame_ids)} keyframe poses "
+              f"({camera['width']}x{camera['height']}, fx={camera['fx']:.1f})...")
+        workloads = project_trajectory(points, camera, w2c, args.mode, args.block)
+        if args.output.endswith(".npz"):
+            # One chunked file, each frame written as soon as it is projected
+            with WorkloadSequenceWriter(args.output) as writer:
+                for frame_id, workload in zip(frame_ids, workloads):
+                    writer.write(frame_id, workload)
+                    print(f"  frame {frame_id}: {workload.num_pixels} entries, "
+                          f"{workload.total_gaussians} Gaussians")
+        else:
+            os.makedirs(args.output, exist_ok=True)
+            for frame_id, workload in zip(frame_ids, workloads):
+                save_workload(workload, sequence_frame_path(args.output, frame_id, args.format))
+                print(f"  frame {frame_id}: {workload.num_pixels} entries, "
+                      f"{workload.total_gaussians} Gaussians")
+        print(f"✅ Saved per-frame workload sequence to {args.output}")
+        print("🎉 Transformation completed successfully!")
+        return
+
     print("🎥 Projecting 3D to 2D...")
-    pixels = project_3d_to_2d(
-        points, 
-        args.width, 
-        args.height, 
-        args.fov, 
-        args.camera_distance
-    )
+    if args.mode == 'splat':
+        workload = project_splats(
+            points,
+            args.width,
+            args.height,
+            args.fov,
+            args.camera_distance,
+            args.block
+        )
+    else:
+        workload = project_3d_to_2d(
+            points, 
+            args.width, 
+            args.height, 
+            args.fov, 
+            args.camera_distance
+        )
     
     print("💾 Saving simulator format...")
-    save_simulator_format(pixels, args.output)
+    save_simulator_format(workload, args.output)
     
     print("🎉 Transformation completed successfully!")
 
@@ -3,8 +3,21 @@
 # Hardware Speedup Simulator Evaluation Script
 # This script runs the RTGS hardware speedup evaluation
 
-# Configuration - Change this path as needed
-POINT_CLOUD_FILE="/home/aeuser/MonoRTGS_ONX/hardware_speedup_simulator/point_cloud.json"
+# Usage: ./run_hardware_eval.sh [point_cloud.ply ...] [-- eval.py options]
+# Point clouds default to the sample point_cloud.json; VENV_ACTIVATE overrides the venv
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+VENV_ACTIVATE="${VENV_ACTIVATE:-$HOME/venvs/jp6torch/bin/activate}"
+
+POINT_CLOUD_FILES=()
+while [ $# -gt 0 ] && [ "$1" != "--" ]; do
+    POINT_CLOUD_FILES+=("$(realpath "$1")")
+    shift
+done
+[ "$1" == "--" ] && shift
+EVAL_ARGS=("$@")
+if [ ${#POINT_CLOUD_FILES[@]} -eq 0 ]; then
+    POINT_CLOUD_FILES=("$SCRIPT_DIR/hardware_speedup_simulator/point_cloud.json")
+fi
 
 # Colors for output
 RED='\033[0;31m'
@@ -16,30 +29,28 @@ NC='\033[0m' # No Color
 echo -e "${BLUE}🚀 Starting RTGS Hardware Speedup Evaluation...${NC}"
 echo "================================================================"
 
-# Check if point cloud file exists
-if [ ! -f "$POINT_CLOUD_FILE" ]; then
-    echo -e "${RED}❌ Error: Point cloud file not found at: $POINT_CLOUD_FILE${NC}"
-    echo "Please update the POINT_CLOUD_FILE variable in this script with the correct path."
-    exit 1
-fi
-
-echo -e "${GREEN}✅ Found point cloud file: $POINT_CLOUD_FILE${NC}"
+# Check if the point cloud files exist
+for POINT_CLOUD_FILE in "${POINT_CLOUD_FILES[@]}"; do
+    if [ ! -f "$POINT_CLOUD_FILE" ]; then
+        echo -e "${RED}❌ Error: Point cloud file not found at: $POINT_CLOUD_FILE${NC}"
+        echo "Pass the point cloud files as arguments of this script."
+        exit 1
+    fi
+    echo -e "${GREEN}✅ Found point cloud file: $POINT_CLOUD_FILE${NC}"
+done
 
 # Activate Python virtual environment
 echo -e "${YELLOW}🔧 Activating Python virtual environment...${NC}"
-source ~/venvs/jp6torch/bin/activate
-
-if [ $? -ne 0 ]; then
-    echo -e "${RED}❌ Failed to activate virtual environment!${NC}"
-    echo "Please check if the virtual environment exists at ~/venvs/jp6torch/bin/activate"
-    exit 1
+if [ -f "$VENV_ACTIVATE" ]; then
+    source "$VENV_ACTIVATE"
+    echo -e "${GREEN}✅ Virtual environment activated successfully${NC}"
+else
+    echo -e "${YELLOW}⚠️ No virtual environment at $VENV_ACTIVATE, using the current Python${NC}"
 fi
 
-echo -e "${GREEN}✅ Virtual environment activated successfully${NC}"
-
 # Change to hardware_speedup_simulator directory
 echo -e "${YELLOW}📁 Changing to hardware_speedup_simulator directory...${NC}"
-cd hardware_speedup_simulator
+cd "$SCRIPT_DIR/hardware_speedup_simulator"
 
 if [ $? -ne 0 ]; then
     echo -e "${RED}❌ Failed to change directory!${NC}"
@@ -49,10 +60,10 @@ fi
 echo -e "${GREEN}✅ Changed to hardware_speedup_simulator directory${NC}"
 
 # Run the evaluation
-echo -e "${YELLOW}🚀 Running evaluation with point cloud file...${NC}"
+echo -e "${YELLOW}🚀 Running evaluation with ${#POINT_CLOUD_FILES[@]} point cloud file(s)...${NC}"
 echo "================================================================"
 
-python eval.py "$POINT_CLOUD_FILE"
+python eval.py "${POINT_CLOUD_FILES[@]}" "${EVAL_ARGS[@]}"
 
 # Check if evaluation was successful
 if [ $? -eq 0 ]; then